@@ -7,5 +7,7 @@ and element processing.
 
 from .model_manager import ModelManager
 from .element_converter import ElementConverter
+from .model_index import ModelIndex, get_model_index
+from .result_cache import ResultCache
 
-__all__ = ["ModelManager", "ElementConverter"]
+__all__ = ["ModelManager", "ElementConverter", "ModelIndex", "get_model_index", "ResultCache"]
@@ -4,7 +4,7 @@ Element conversion utilities for sgraph elements.
 Handles conversion of SElement objects to dictionaries and other formats.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from sgraph import SElement
 
 
@@ -17,20 +17,21 @@ class ElementConverter:
         additional_fields: List[str] = None,
     ) -> Dict[str, Any]:
         """Convert an SElement to a dictionary representation."""
-        if additional_fields is None:
-            additional_fields = []
-            
+        # Child paths extend the element's own path instead of each child
+        # walking its parent chain again via getPath()
+        path = element.getPath()
         result = {
             "name": element.name,
-            "path": element.getPath(),
+            "path": path,
             "type": element.getType(),
-            "child_paths": [child.getPath() for child in element.children],
+            "child_paths": [path + "/" + child.name for child in element.children],
         }
         
         # Add any additional fields requested
-        for field in additional_fields:
-            if hasattr(element, field):
-                result[field] = getattr(element, field)
+        if additional_fields:
+            for field in additional_fields:
+                if hasattr(element, field):
+                    result[field] = getattr(element, field)
         
         return result
     
@@ -40,16 +41,21 @@ class ElementConverter:
         additional_fields: List[str] = None,
     ) -> List[Dict[str, Any]]:
         """Convert a list of SElements to a list of dictionaries."""
-        return [
-            ElementConverter.element_to_dict(element, additional_fields)
-            for element in elements
-        ]
+        to_dict = ElementConverter.element_to_dict
+        return [to_dict(element, additional_fields) for element in elements]
     
     @staticmethod
-    def association_to_dict(association) -> Dict[str, Any]:
-        """Convert an association to a dictionary representation."""
+    def association_to_dict(
+        association,
+        from_path: Optional[str] = None,
+        to_path: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Convert an association to a dictionary representation.
+
+        Callers that already know the endpoint paths can pass them in.
+        """
         return {
-            "from": association.fromElement.getPath(),
-            "to": association.toElement.getPath(),
+            "from": association.fromElement.getPath() if from_path is None else from_path,
+            "to": association.toElement.getPath() if to_path is None else to_path,
             "type": getattr(association, 'type', 'unknown'),
         }
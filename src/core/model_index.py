@@ -0,0 +1,412 @@
+"""
+Flattened element index for sgraph models.
+
+Builds a read-only, list-based view of a model's element tree once per model
+so scan-heavy queries can work over plain arrays instead of walking SElements.
+"""
+
+import bisect
+import functools
+import itertools
+import logging
+import operator
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from sgraph import SElement, SGraph
+
+try:
+    import hyperscan
+except ImportError:  # Optional dependency: pip install hyperscan
+    hyperscan = None
+
+try:
+    import numpy
+except ImportError:  # Optional dependency: pip install numpy
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+HYPERSCAN_AVAILABLE = hyperscan is not None
+NUMPY_AVAILABLE = numpy is not None
+
+# Hyperscan scans over more name bytes than this are split across threads
+PARALLEL_SCAN_BYTES = 8 * 1024 * 1024
+SCAN_WORKERS = min(8, os.cpu_count() or 1)
+
+# Hyperscan reads patterns as PCRE; its matches are confirmed with re, which
+# only removes extra candidates. Patterns using syntax the two read differently
+# are left to re, as matches Hyperscan misses would be lost:
+#   \A \Z \z     names are scanned as one newline-joined buffer, so these
+#                would anchor to its ends rather than to each name
+#   \N           a named character in re, "not a newline" in PCRE
+#   {,n}         a 0..n quantifier in re, literal text in PCRE
+#   *+ ++ ?+ }+  possessive quantifiers
+#   (?>          atomic groups
+#   [:           POSIX classes in PCRE, plain characters in re
+_PCRE_DIFFERENCES = re.compile(r"\\[AZzN]|\{,|[*+?}]\+|\(\?>|\[:")
+
+
+class _CompiledPattern:
+    """A Hyperscan database with a scratch space per scanning thread.
+
+    Compiled patterns are cached and shared between threads, but a scratch
+    space can only be used by one scan at a time.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._local = threading.local()
+
+    def scratch(self):
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self.database)
+        return scratch
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_database(expression: str, flags: int) -> Optional[_CompiledPattern]:
+    """Compile a Hyperscan database, cached per expression and flags.
+
+    Returns None when Hyperscan cannot handle the expression.
+    """
+    try:
+        database = hyperscan.Database()
+        database.compile(expressions=[expression.encode("utf-8")], flags=[flags])
+    except hyperscan.error as e:
+        logger.debug("Hyperscan cannot compile pattern %r: %s", expression, e)
+        return None
+    return _CompiledPattern(database)
+
+
+class ModelIndex:
+    """Preorder arrays over the elements of a model.
+
+    Elements are stored in the same order as the stack-based traversals used by
+    the search code, so every subtree occupies a contiguous index range and
+    scoped results come out in the same order as a direct traversal.
+    """
+
+    def __init__(self, root: SElement):
+        # The walk only collects elements; pushing the children lists as they
+        # are avoids building a (child, parent, depth) tuple per element
+        elements: List[SElement] = []
+        append = elements.append
+        stack = [root]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            element = pop()
+            append(element)
+            extend(element.children)
+
+        positions = {id(element): index for index, element in enumerate(elements)}
+        # Parent and depth columns from the parent links; parents precede
+        # their children, so each depth is known when its children are reached
+        parents = [-1]
+        parents += [positions[id(element.parent)] for element in elements[1:]]
+        depths = [0] * len(elements)
+        for index in range(1, len(elements)):
+            depths[index] = depths[parents[index]] + 1
+
+        # Children always come after their parent, so sizes accumulate bottom-up
+        sizes = [1] * len(elements)
+        for index in range(len(elements) - 1, 0, -1):
+            sizes[parents[index]] += sizes[index]
+
+        self.elements = elements
+        self.depths = depths
+        self.names = [element.name for element in elements]
+        # Raw type attribute per element ('' when unset, like SElement.getType).
+        # Types are interned so the column holds one string object per distinct
+        # type and equality checks mostly resolve by identity.
+        self.types = [_intern_type(element.attrs.get("type", "")) for element in elements]
+        self.subtree_end = [index + size for index, size in enumerate(sizes)]
+        self._positions = positions
+
+        self._paths: List[Optional[str]] = [None] * len(elements)
+        self._name_positions: Optional[Dict[str, List[int]]] = None
+        self._type_positions: Optional[Dict[str, List[int]]] = None
+        self._names_blob: Optional[bytes] = None
+        self._line_starts: Optional[List[int]] = None
+        # Per-depth element totals and per-type running totals over depth,
+        # built on the first count_depths_and_types call
+        self._depth_totals: Optional[List[int]] = None
+        self._cumulative_type_counts: Optional[List[List[int]]] = None
+        self._type_labels: Optional[List] = None
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def scope_range(self, element: SElement) -> Optional[Tuple[int, int]]:
+        """Return the [start, end) index range of an element's subtree."""
+        index = self._positions.get(id(element))
+        if index is None:
+            return None
+        return index, self.subtree_end[index]
+
+    def path_of(self, element: SElement) -> str:
+        """Return the element's path, memoized for elements of this index.
+
+        Models are not modified after loading, so cached paths stay valid.
+        """
+        index = self._positions.get(id(element))
+        if index is None:
+            return element.getPath()
+        path = self._paths[index]
+        if path is None:
+            path = self._paths[index] = element.getPath()
+        return path
+
+    def subtree(self, element: SElement, max_depth: Optional[int] = None) -> Optional[List[SElement]]:
+        """Return an element's subtree in traversal order, or None if it is not indexed.
+
+        With ``max_depth``, only elements at most that many levels below ``element``.
+        """
+        scope = self.scope_range(element)
+        if scope is None:
+            return None
+        start, end = scope
+        if max_depth is None:
+            return self.elements[start:end]
+        limit = self.depths[start] + max_depth
+        return [
+            subtree_element
+            for subtree_element, depth in zip(self.elements[start:end], self.depths[start:end])
+            if depth <= limit
+        ]
+
+    @property
+    def name_positions(self) -> Dict[str, List[int]]:
+        """Map of element name to its ascending indices, built on first use."""
+        if self._name_positions is None:
+            self._name_positions = _group_positions(self.names)
+        return self._name_positions
+
+    @property
+    def type_positions(self) -> Dict[str, List[int]]:
+        """Map of element type to its ascending indices, built on first use."""
+        if self._type_positions is None:
+            self._type_positions = _group_positions(self.types)
+        return self._type_positions
+
+    def find_types(self, element_type: str, start: int, end: int) -> List[int]:
+        """Return indices in [start, end) whose type equals ``element_type``."""
+        indices = self.type_positions.get(element_type)
+        if not indices:
+            return []
+        return _slice_range(indices, start, end)
+
+    def find_names(self, names: Iterable[str], start: int, end: int) -> List[int]:
+        """Return indices in [start, end) whose name is one of ``names``."""
+        name_positions = self.name_positions
+        matches = []
+        for name in names:
+            indices = name_positions.get(name)
+            if indices:
+                matches.extend(_slice_range(indices, start, end))
+        matches.sort()
+        return matches
+
+    def find_names_containing(self, text: str, start: int, end: int) -> List[int]:
+        """Return indices in [start, end) whose name contains ``text``.
+
+        Only distinct names are compared, which is far fewer than the element count.
+        """
+        return self.find_names((name for name in self.name_positions if text in name), start, end)
+
+    def find_names_matching(self, regex: re.Pattern, start: int, end: int) -> List[int]:
+        """Return indices in [start, end) whose name matches ``regex`` (re.search).
+
+        Like find_names_containing, each distinct name is tested only once.
+        """
+        return self.find_names(filter(regex.search, self.name_positions), start, end)
+
+    def count_depths_and_types(self, max_depth: int) -> Tuple[Dict[int, int], Dict]:
+        """Count elements per depth and per type among those at most ``max_depth`` deep.
+
+        Types are the raw type column values, in order of first appearance in
+        the index. Answered from per-depth running totals computed once per
+        index, so the cost does not depend on the size of the model.
+        """
+        if self._depth_totals is None:
+            self._build_depth_type_totals()
+        last_depth = min(max_depth, len(self._depth_totals) - 1)
+        if last_depth < 0:
+            return {}, {}
+        return (
+            {depth: count for depth, count in enumerate(self._depth_totals[:last_depth + 1]) if count},
+            {
+                label: count
+                for label, count in zip(self._type_labels, self._cumulative_type_counts[last_depth])
+                if count
+            },
+        )
+
+    def _build_depth_type_totals(self) -> None:
+        """Tabulate elements per (depth, type) and accumulate the rows over depth."""
+        labels = list(self.type_positions)
+        codes = {label: code for code, label in enumerate(labels)}
+        type_count = len(labels)
+        depth_count = max(self.depths, default=-1) + 1
+
+        if numpy is not None:
+            # Vectorized over struct-of-arrays copies of the depth and type columns
+            depths = numpy.array(self.depths, dtype=numpy.int64)
+            type_codes = numpy.fromiter(map(codes.__getitem__, self.types), dtype=numpy.int64, count=len(self))
+            table = numpy.bincount(
+                depths * type_count + type_codes, minlength=depth_count * type_count
+            ).reshape(depth_count, type_count)
+            depth_totals = table.sum(axis=1).tolist()
+            cumulative = table.cumsum(axis=0).tolist()
+        else:
+            # One fixed-size list of counts indexed by depth * type_count + code;
+            # list increments are cheaper than hashing (depth, type) keys
+            counts = [0] * (depth_count * type_count)
+            for depth, code in zip(self.depths, map(codes.__getitem__, self.types)):
+                counts[depth * type_count + code] += 1
+            table = [counts[row:row + type_count] for row in range(0, len(counts), type_count)]
+            depth_totals = [sum(row) for row in table]
+            cumulative = list(itertools.accumulate(table, lambda total, row: list(map(operator.add, total, row))))
+
+        self._type_labels = labels
+        self._depth_totals = depth_totals
+        self._cumulative_type_counts = cumulative
+
+    def search_names(self, regex: re.Pattern, start: int, end: int) -> Optional[List[int]]:
+        """Return indices in [start, end) whose name matches ``regex``, using Hyperscan.
+
+        Returns None when Hyperscan is not installed, cannot compile the pattern
+        or would read it differently from re (see _PCRE_DIFFERENCES), in which
+        case the caller should fall back to a Python traversal.
+        """
+        if hyperscan is None or start >= end:
+            return None
+        # A VERBOSE flag given outside the pattern would not reach Hyperscan
+        if regex.flags & re.VERBOSE or _PCRE_DIFFERENCES.search(regex.pattern):
+            return None
+        if not self._build_names_blob():
+            return None
+
+        flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_MULTILINE
+        if regex.flags & re.IGNORECASE:
+            flags |= hyperscan.HS_FLAG_CASELESS
+        if regex.flags & re.DOTALL:
+            flags |= hyperscan.HS_FLAG_DOTALL
+
+        pattern = _compile_database(regex.pattern, flags)
+        if pattern is None:
+            return None
+
+        line_starts = self._line_starts
+        if SCAN_WORKERS > 1 and line_starts[end] - line_starts[start] > PARALLEL_SCAN_BYTES:
+            # Hyperscan releases the GIL while scanning; each shard of the
+            # range is scanned on its own thread, with that thread's scratch
+            step = -(-(end - start) // SCAN_WORKERS)
+            bounds = [(low, min(low + step, end)) for low in range(start, end, step)]
+            with ThreadPoolExecutor(max_workers=len(bounds)) as executor:
+                shards = executor.map(lambda bound: self._scan_lines(pattern, *bound), bounds)
+                candidates = [index for shard in shards for index in shard]
+        else:
+            candidates = self._scan_lines(pattern, start, end)
+
+        # Confirm with the Python regex so results match re.search semantics exactly
+        names = self.names
+        return [index for index in candidates if regex.search(names[index])]
+
+    def _scan_lines(self, pattern: _CompiledPattern, start: int, end: int) -> List[int]:
+        """Scan names [start, end) of the names buffer; return candidate indices in order."""
+        # Names are newline-separated; scan only the slice covering the range
+        line_starts = self._line_starts
+        base = line_starts[start]
+        match_ends = []
+
+        def on_match(expression_id, match_from, match_to, flags, context):
+            match_ends.append(match_to)
+
+        pattern.database.scan(
+            self._names_blob[base:line_starts[end] - 1],
+            match_event_handler=on_match,
+            scratch=pattern.scratch(),
+        )
+
+        # Hyperscan reports every match end; map them back to names
+        return sorted({
+            bisect.bisect_right(line_starts, base + match_to - 1) - 1
+            for match_to in match_ends
+        })
+
+    def _build_names_blob(self) -> bool:
+        """Lazily build the newline-separated names buffer used for Hyperscan scans."""
+        if self._names_blob is None:
+            if any("\n" in name for name in self.names):
+                # Line boundaries would no longer identify elements
+                self._names_blob = b""
+                self._line_starts = []
+                return False
+
+            line_starts = []
+            offset = 0
+            for name in self.names:
+                line_starts.append(offset)
+                offset += len(name.encode("utf-8")) + 1
+            line_starts.append(offset)
+
+            self._names_blob = "\n".join(self.names).encode("utf-8")
+            self._line_starts = line_starts
+        return bool(self._line_starts)
+
+
+def _intern_type(element_type):
+    return sys.intern(element_type) if type(element_type) is str else element_type
+
+
+def _group_positions(values: List) -> Dict:
+    """Group list positions by value; each position list is ascending."""
+    positions: Dict = {}
+    for index, value in enumerate(values):
+        positions.setdefault(value, []).append(index)
+    return positions
+
+
+def _slice_range(indices: List[int], start: int, end: int) -> List[int]:
+    """Return the part of an ascending index list that falls in [start, end)."""
+    low = bisect.bisect_left(indices, start)
+    high = bisect.bisect_left(indices, end, low)
+    return indices[low:high]
+
+
+_indexes: "WeakKeyDictionary[SGraph, ModelIndex]" = WeakKeyDictionary()
+
+
+def get_model_index(model: SGraph, build: bool = True) -> Optional[ModelIndex]:
+    """Get the flattened index for a model, building it on first use.
+
+    With ``build=False`` only an already built index is returned (or None).
+    """
+    index = _indexes.get(model)
+    if index is None and build:
+        index = ModelIndex(model.rootNode)
+        _indexes[model] = index
+        logger.debug(f"Built model index with {len(index)} elements")
+    return index
+
+
+def forget_model_index(model: SGraph) -> None:
+    """Drop a model's index (e.g. when the model is removed); it is rebuilt on next use."""
+    if model in _indexes:
+        del _indexes[model]
+
+
+def build_model_index(model: SGraph) -> ModelIndex:
+    """Build a model's index together with its name and type lookup tables (e.g. at load time)."""
+    index = get_model_index(model)
+    index.name_positions
+    index.type_positions
+    return index
@@ -6,40 +6,122 @@ Handles loading, caching, and lifecycle management of sgraph models.
 
 import asyncio
 import logging
-import time
 import os
-from typing import Optional, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from weakref import WeakSet, WeakValueDictionary
 
 import nanoid
 from sgraph import SGraph
 from sgraph.loader.modelloader import ModelLoader
 
+from src.core.model_index import build_model_index, forget_model_index
+from src.core.model_snapshot import (
+    load_snapshot,
+    remove_stale_snapshots,
+    save_snapshot,
+    snapshot_path,
+)
+
 logger = logging.getLogger(__name__)
 
 
+def _stat_model_file(path: str) -> Optional[os.stat_result]:
+    """Stat a model file; None if it does not exist (like os.path.exists)."""
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+
+def _loads_attribute_files(path: str) -> bool:
+    """Whether ModelLoader also reads the attribute files next to this model file.
+
+    ModelLoader decides from the path string exactly as it is given.
+    """
+    return path.endswith(("/dependency/modelfile.xml", "/dependency/modelfile.xml.zip"))
+
+
+def _model_file_path(path: str) -> str:
+    """Absolute path that identifies the model loaded from ``path``.
+
+    Symlinks are resolved so every name of a file maps to the same model,
+    except for models loaded with their attribute files: those also depend
+    on the directory the given path is in.
+    """
+    if _loads_attribute_files(path):
+        return os.path.abspath(path)
+    return os.path.realpath(path)
+
+
+def _file_key(abs_path: str, stat_result: os.stat_result) -> Tuple[str, int, int]:
+    """Identify a model file version by path, modification time and size."""
+    return abs_path, stat_result.st_mtime_ns, stat_result.st_size
+
+
 class ModelManager:
     """Manages sgraph model loading and caching."""
 
+    # Where parsed models are snapshotted for faster reloads; None (the
+    # default) disables it. Class-wide so the server's --snapshot-dir option
+    # configures every manager at once.
+    snapshot_dir: Optional[str] = None
+    # Directory the load_model tools may load from (symlinks resolved); None
+    # allows any path. Set by the server's --model-root option.
+    model_root: Optional[str] = None
+
+    # Models are shared by every manager in the process, keyed by file version,
+    # for as long as something references them; the most recently loaded few
+    # are also kept alive here.
+    RECENT_MODELS = 4
+    _shared_models: "WeakValueDictionary[Tuple[str, int, int], SGraph]" = WeakValueDictionary()
+    _recent_models: "OrderedDict[Tuple[str, int, int], SGraph]" = OrderedDict()
+    _shared_lock = threading.Lock()
+    # Live managers, to tell whether a shared model is still held by another
+    _managers: "WeakSet[ModelManager]" = WeakSet()
+
     def __init__(self):
         self._models: Dict[str, SGraph] = {}
         self._model_paths: Dict[str, str] = {}  # model_id -> path
+        # (path, mtime, size) -> model_id, so reloading an unchanged file is free
+        self._loaded_files: Dict[Tuple[str, int, int], str] = {}
         self._loader = ModelLoader()
         self._default_model_id: Optional[str] = None
         self.default_scope: Optional[str] = None
+        # Called with the model ID whenever a model is dropped from the cache
+        self._removal_listeners: List[Callable[[str], None]] = []
+        with ModelManager._shared_lock:
+            ModelManager._managers.add(self)
         logger.info("🔧 ModelManager initialized")
     
-    async def load_model(self, path: str) -> str:
-        """Load a sgraph model with comprehensive logging and error handling."""
+    async def load_model(self, path: str, stat_result: Optional[os.stat_result] = None) -> str:
+        """Load a sgraph model with comprehensive logging and error handling.
+        
+        ``stat_result`` may be passed when the caller already stat'ed the path
+        (see validate_path), saving another filesystem round trip.
+        """
         logger.info(f"🔍 Starting to load model from: {path}")
         
         # Validate file exists
-        if not os.path.exists(path):
-            error_msg = f"Model file does not exist: {path}"
-            logger.error(f"❌ {error_msg}")
-            raise FileNotFoundError(error_msg)
+        if stat_result is None:
+            stat_result = _stat_model_file(path)
+            if stat_result is None:
+                error_msg = f"Model file does not exist: {path}"
+                logger.error(f"❌ {error_msg}")
+                raise FileNotFoundError(error_msg)
+        
+        # Reuse the model if this exact file version is already loaded
+        abs_path = _model_file_path(path)
+        file_key = _file_key(abs_path, stat_result)
+        model_id = self._loaded_files.get(file_key)
+        if model_id is not None:
+            logger.info(f"♻️ Model already loaded from {path}, reusing ID: {model_id}")
+            return model_id
         
         # Check file size for logging
-        file_size = os.path.getsize(path)
+        file_size = stat_result.st_size
         logger.info(f"📁 File size: {file_size / (1024*1024):.1f} MB")
         
         start_time = time.perf_counter()
@@ -48,12 +130,16 @@ class ModelManager:
             logger.info(f"⏳ Loading model using ModelLoader...")
             # Use asyncio.to_thread with timeout to prevent hanging
             model = await asyncio.wait_for(
-                asyncio.to_thread(self._loader.load_model, path),
+                asyncio.to_thread(self._read_model, path, abs_path, stat_result),
                 timeout=300.0  # 5 minute timeout for large models
             )
             
             load_time = time.perf_counter() - start_time
             logger.info(f"✅ Model loaded successfully in {load_time:.2f} seconds")
+
+            # Flatten the model into columnar lookup tables for scan-heavy queries
+            index = await asyncio.to_thread(build_model_index, model)
+            logger.info(f"🗂️ Model index built for {len(index)} elements")
             
             # Generate unique model ID
             model_id = nanoid.generate(size=24)
@@ -61,7 +147,8 @@ class ModelManager:
             
             # Store model in memory cache
             self._models[model_id] = model
-            self._model_paths[model_id] = os.path.abspath(path)
+            self._model_paths[model_id] = abs_path
+            self._loaded_files[file_key] = model_id
             logger.info(f"💾 Model cached in memory (total models: {len(self._models)})")
             
             # Log basic model info
@@ -86,32 +173,93 @@ class ModelManager:
         """Load a model synchronously (for startup auto-load)."""
         logger.info(f"🔍 Sync-loading model from: {path}")
 
-        if not os.path.exists(path):
+        stat_result = _stat_model_file(path)
+        if stat_result is None:
             raise FileNotFoundError(f"Model file does not exist: {path}")
 
-        # Check if already loaded from this path
-        abs_path = os.path.abspath(path)
-        for mid, mpath in self._model_paths.items():
-            if mpath == abs_path:
-                logger.info(f"♻️ Model already loaded from {path}, reusing ID: {mid}")
-                return mid
+        # Check if already loaded from this path (and the file is unchanged)
+        abs_path = _model_file_path(path)
+        file_key = _file_key(abs_path, stat_result)
+        model_id = self._loaded_files.get(file_key)
+        if model_id is not None:
+            logger.info(f"♻️ Model already loaded from {path}, reusing ID: {model_id}")
+            return model_id
 
-        file_size = os.path.getsize(path)
+        file_size = stat_result.st_size
         logger.info(f"📁 File size: {file_size / (1024*1024):.1f} MB")
 
         start_time = time.perf_counter()
-        model = self._loader.load_model(path)
+        model = self._read_model(path, abs_path, stat_result)
         load_time = time.perf_counter() - start_time
         logger.info(f"✅ Model loaded in {load_time:.2f}s")
 
+        index = build_model_index(model)
+        logger.info(f"🗂️ Model index built for {len(index)} elements")
+
         model_id = nanoid.generate(size=24)
         self._models[model_id] = model
         self._model_paths[model_id] = abs_path
+        self._loaded_files[file_key] = model_id
         self._default_model_id = model_id
         logger.info(f"🆔 Model ID: {model_id} (set as default)")
 
         return model_id
 
+    def _read_model(self, path: str, abs_path: str, stat_result: os.stat_result) -> SGraph:
+        """Get the model for a file version, reusing one another manager already loaded."""
+        file_key = _file_key(abs_path, stat_result)
+        with ModelManager._shared_lock:
+            model = ModelManager._shared_models.get(file_key)
+        if model is not None:
+            logger.info(f"♻️ Sharing model already loaded in this process: {path}")
+        else:
+            model = self._parse_model(path, abs_path, stat_result)
+            with ModelManager._shared_lock:
+                model = ModelManager._shared_models.setdefault(file_key, model)
+
+        with ModelManager._shared_lock:
+            recent = ModelManager._recent_models
+            recent[file_key] = model
+            recent.move_to_end(file_key)
+            while len(recent) > ModelManager.RECENT_MODELS:
+                recent.popitem(last=False)
+        return model
+
+    @classmethod
+    def clear_shared_models(cls) -> None:
+        """Forget models shared between managers (models held by a manager stay loaded)."""
+        with cls._shared_lock:
+            cls._shared_models.clear()
+            cls._recent_models.clear()
+
+    def _parse_model(self, path: str, abs_path: str, stat_result: os.stat_result) -> SGraph:
+        """Parse a model file, or restore it from a snapshot of the same file version."""
+        # Models next to attribute files also depend on those; never snapshot them.
+        # ModelLoader goes by the given path, which may be a symlink.
+        if (
+            not self.snapshot_dir
+            or _loads_attribute_files(path)
+            or _loads_attribute_files(abs_path)
+        ):
+            return self._loader.load_model(path)
+
+        cached_path = snapshot_path(self.snapshot_dir, abs_path, stat_result)
+        model = load_snapshot(cached_path)
+        if model is not None:
+            logger.info(f"⚡ Model restored from snapshot: {cached_path}")
+            return model
+
+        model = self._loader.load_model(path)
+        try:
+            save_snapshot(model, cached_path)
+            # Snapshots of earlier versions of the file are never read again
+            removed = remove_stale_snapshots(cached_path)
+            if removed:
+                logger.info(f"🗑️ Removed {removed} outdated snapshot(s) of {path}")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write model snapshot {cached_path}: {e}")
+        return model
+
     @property
     def default_model_id(self) -> Optional[str]:
         """Get the default model ID (set by auto-load or first loaded model)."""
@@ -131,17 +279,52 @@ class ModelManager:
             }
         return models_info
     
+    def on_model_removed(self, listener: Callable[[str], None]) -> None:
+        """Register a callback invoked with the model ID when a model is removed.
+
+        Listeners run before the model is dropped, so get_model still returns it.
+        """
+        if listener not in self._removal_listeners:
+            self._removal_listeners.append(listener)
+
+    def is_held_elsewhere(self, model: SGraph) -> bool:
+        """Whether another manager in this process also holds ``model`` (see _read_model)."""
+        with ModelManager._shared_lock:
+            managers = list(ModelManager._managers)
+        return any(
+            held is model
+            for manager in managers if manager is not self
+            for held in manager._models.values()
+        )
+
+    def _drop_model(self, model_id: str) -> None:
+        """Notify listeners, then drop the model and the lookup tables derived from it.
+
+        Models are shared between managers, so the lookup tables are kept while
+        another manager still holds the model; listeners that drop data kept
+        per model should check is_held_elsewhere the same way.
+        """
+        for listener in self._removal_listeners:
+            listener(model_id)
+        model = self._models.pop(model_id)
+        if not self.is_held_elsewhere(model):
+            forget_model_index(model)
+        self._model_paths.pop(model_id, None)
+        for file_key in [key for key, loaded_id in self._loaded_files.items() if loaded_id == model_id]:
+            del self._loaded_files[file_key]
+
     def clear_cache(self) -> int:
         """Clear all cached models and return count of cleared models."""
-        count = len(self._models)
-        self._models.clear()
-        logger.info(f"🗑️ Cleared {count} models from cache")
-        return count
+        model_ids = list(self._models)
+        for model_id in model_ids:
+            self._drop_model(model_id)
+        logger.info(f"🗑️ Cleared {len(model_ids)} models from cache")
+        return len(model_ids)
     
     def remove_model(self, model_id: str) -> bool:
         """Remove a specific model from cache."""
         if model_id in self._models:
-            del self._models[model_id]
+            self._drop_model(model_id)
             logger.info(f"🗑️ Removed model {model_id} from cache")
             return True
         return False
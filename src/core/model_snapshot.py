@@ -0,0 +1,192 @@
+"""
+On-disk snapshots of parsed sgraph models.
+
+Parsing a large zipped XML model takes seconds; a snapshot of the parsed
+model, keyed by the model file's path, modification time and size, loads
+much faster. Only the newest snapshot of each model file is kept. Snapshots
+hold only plain lists, dicts and strings (no pickled classes), so loading
+one cannot execute code.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Dict, List, Optional
+
+from sgraph import SElement, SElementAssociation, SGraph
+
+logger = logging.getLogger(__name__)
+
+# Bump when the snapshot layout changes; old snapshots are then ignored
+SNAPSHOT_VERSION = 1
+
+
+def default_snapshot_dir() -> str:
+    """Per-user cache directory for model snapshots."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "sgraph-mcp")
+
+
+def snapshot_path(snapshot_dir: str, real_path: str, stat_result: os.stat_result) -> str:
+    """Snapshot file for one version (path, mtime, size) of a model file.
+
+    The file name starts with a digest of the path alone, shared by the
+    snapshots of every version of that model file.
+    """
+    path_digest = hashlib.sha1(real_path.encode("utf-8")).hexdigest()
+    version = f"{SNAPSHOT_VERSION}|{stat_result.st_mtime_ns}|{stat_result.st_size}"
+    version_digest = hashlib.sha1(version.encode("utf-8")).hexdigest()
+    return os.path.join(snapshot_dir, f"{path_digest}-{version_digest}.pkl")
+
+
+def remove_stale_snapshots(path: str) -> int:
+    """Delete the other snapshots of the model file that ``path`` is a snapshot of.
+
+    Returns the number of snapshots removed.
+    """
+    directory, name = os.path.split(path)
+    prefix = name.partition("-")[0] + "-"
+    removed = 0
+    with os.scandir(directory) as entries:
+        stale = [
+            entry.path for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith(".pkl") and entry.name != name
+        ]
+    for stale_path in stale:
+        try:
+            os.unlink(stale_path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+class _PlainUnpickler(pickle.Unpickler):
+    """Unpickler that refuses to load any class or function."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Unexpected object in model snapshot: {module}.{name}")
+
+
+def save_snapshot(model: SGraph, path: str) -> None:
+    """Write a snapshot of ``model`` to ``path`` (atomically)."""
+    # Elements in preorder with children in order, so rebuilding them by
+    # appending to their parents restores every children list as it was
+    elements: List[SElement] = []
+    stack = [model.rootNode]
+    while stack:
+        element = stack.pop()
+        elements.append(element)
+        stack.extend(reversed(element.children))
+    positions = {id(element): index for index, element in enumerate(elements)}
+
+    parents = [-1] + [positions[id(element.parent)] for element in elements[1:]]
+    associations = []
+    association_ids: Dict[int, int] = {}
+    for element in elements:
+        for association in element.outgoing:
+            association_ids[id(association)] = len(associations)
+            associations.append((
+                positions[id(association.fromElement)],
+                positions[id(association.toElement)],
+                association.deptype,
+                association.attrs,
+            ))
+    # Incoming lists are stored separately to keep their order
+    incoming = [
+        [association_ids[id(association)] for association in element.incoming]
+        for element in elements
+    ]
+    # Duplicate-lookup index of SElementAssociation (left empty by the XML parser)
+    incoming_index = [
+        [association_ids[id(association)] for association in element._incoming_index.values()]
+        for element in elements
+    ]
+
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "names": [element.name for element in elements],
+        "human_readable_names": [element.human_readable_name for element in elements],
+        "attrs": [element.attrs for element in elements],
+        "parents": parents,
+        "associations": associations,
+        "incoming": incoming,
+        "incoming_index": incoming_index,
+        "modelAttrs": model.modelAttrs,
+        "metaAttrs": model.metaAttrs,
+        "propagateActions": model.propagateActions,
+    }
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_snapshot(path: str) -> Optional[SGraph]:
+    """Rebuild a model from a snapshot; None if there is no usable snapshot."""
+    try:
+        with open(path, "rb") as f:
+            snapshot = _PlainUnpickler(f).load()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable model snapshot {path}: {e}")
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    # Elements are created without SElement.__init__, which would otherwise
+    # look up every name in its parent's childrenDict again
+    new_element = SElement.__new__
+    elements: List[SElement] = []
+    for name, human_readable_name, attrs, parent_index in zip(
+        snapshot["names"], snapshot["human_readable_names"], snapshot["attrs"], snapshot["parents"]
+    ):
+        element = new_element(SElement)
+        element.name = name
+        element.human_readable_name = human_readable_name
+        element.attrs = attrs
+        element.children = []
+        element.childrenDict = {}
+        element.outgoing = []
+        element.incoming = []
+        element._incoming_index = {}
+        if parent_index < 0:
+            element.parent = None
+        else:
+            parent = elements[parent_index]
+            element.parent = parent
+            parent.children.append(element)
+            parent.childrenDict[name] = element
+        elements.append(element)
+
+    new_association = SElementAssociation.__new__
+    associations = []
+    for from_index, to_index, deptype, attrs in snapshot["associations"]:
+        association = new_association(SElementAssociation)
+        association.fromElement = from_element = elements[from_index]
+        association.toElement = elements[to_index]
+        association.deptype = deptype
+        association.attrs = attrs
+        from_element.outgoing.append(association)
+        associations.append(association)
+    for element, incoming, indexed in zip(elements, snapshot["incoming"], snapshot["incoming_index"]):
+        element.incoming = [associations[association_id] for association_id in incoming]
+        for association_id in indexed:
+            association = associations[association_id]
+            element._incoming_index[(id(association.fromElement), association.deptype)] = association
+
+    model = SGraph(elements[0])
+    model.modelAttrs = snapshot["modelAttrs"]
+    model.metaAttrs = snapshot["metaAttrs"]
+    model.propagateActions = snapshot["propagateActions"]
+    return model
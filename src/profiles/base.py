@@ -46,11 +46,13 @@ def register_load_model(mcp: FastMCP) -> None:
                     "default_scope": model_manager.default_scope,
                 }
 
-            is_valid, error = validate_path(input.path, must_exist=True)
+            is_valid, error, stat_result = validate_path(
+                input.path, must_exist=True, root=model_manager.model_root
+            )
             if not is_valid:
                 return {"error": f"Invalid path: {error}"}
 
-            model_id = await model_manager.load_model(input.path)
+            model_id = await model_manager.load_model(input.path, stat_result)
             return {"model_id": model_id}
 
         except FileNotFoundError as e:
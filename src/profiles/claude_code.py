@@ -20,6 +20,7 @@ Design principles:
 - JSON output for reliable parsing by LLMs
 """
 
+import asyncio
 from typing import Optional, Literal
 from pydantic import BaseModel, Field
 from mcp.server.fastmcp import FastMCP
@@ -396,7 +397,9 @@ class ClaudeCodeProfile:
             scope = input.scope_path or model_manager.default_scope
 
             try:
-                elements = SearchService.search_elements_by_name(
+                # Full-model scans are CPU-bound; run them off the event loop
+                elements = await asyncio.to_thread(
+                    SearchService.search_elements_by_name,
                     model,
                     input.query,
                     element_type=input.element_types[0] if input.element_types else None,
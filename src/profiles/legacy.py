@@ -27,7 +27,8 @@ class LegacyProfile:
                 sgraph_get_high_level_dependencies
     - Navigation: sgraph_get_root_element, sgraph_get_element,
                   sgraph_get_element_incoming_associations,
-                  sgraph_get_element_outgoing_associations
+                  sgraph_get_element_outgoing_associations,
+                  sgraph_get_elements_batch
     """
 
     name = "legacy"
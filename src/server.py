@@ -15,6 +15,8 @@ import argparse
 import sys
 from mcp.server.fastmcp import FastMCP
 
+from src.core.model_manager import ModelManager
+from src.core.model_snapshot import default_snapshot_dir
 from src.utils.logging import setup_logging
 from src.profiles import get_profile, list_profiles
 
@@ -62,6 +64,21 @@ Examples:
         default=None,
         help="Path to model file to load automatically at startup",
     )
+    parser.add_argument(
+        "--snapshot-dir",
+        type=str,
+        nargs="?",
+        const=default_snapshot_dir(),
+        default=None,
+        help="Snapshot parsed models to speed up reloads, in this directory "
+        "(~/.cache/sgraph-mcp if none is given). Off by default",
+    )
+    parser.add_argument(
+        "--model-root",
+        type=str,
+        default=None,
+        help="Only let the load_model tool load files inside this directory",
+    )
     parser.add_argument(
         "--default-scope",
         type=str,
@@ -82,6 +99,11 @@ def main():
     # Set up logging (must use stderr for stdio transport)
     setup_logging(stream=log)
 
+    if args.snapshot_dir:
+        ModelManager.snapshot_dir = args.snapshot_dir
+    if args.model_root:
+        ModelManager.model_root = args.model_root
+
     # Create MCP server
     mcp = FastMCP("SGraph")
     mcp.settings.port = args.port
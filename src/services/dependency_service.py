@@ -9,6 +9,7 @@ from typing import Dict, Any, Optional, Set, List
 
 from sgraph import SGraph, SElement
 from src.core.element_converter import ElementConverter
+from src.core.model_index import get_model_index
 
 logger = logging.getLogger(__name__)
 
@@ -38,55 +39,65 @@ class DependencyService:
             logger.warning(f"Root path not found: {root_path}")
             return result
         
-        subtree_elements = set()
-        subtree_paths = set()
-        
-        # Build subtree using iterative traversal
-        stack = [(root_element, 0)]
-        while stack:
-            element, depth = stack.pop()
-            
-            if max_depth is not None and depth > max_depth:
-                continue
+        # The model index holds the subtree as a contiguous slice and caches
+        # element paths; fall back to a traversal for unindexed elements
+        index = get_model_index(model)
+        subtree_elements = index.subtree(root_element, max_depth)
+        if subtree_elements is None:
+            subtree_elements = []
+            stack = [(root_element, 0)]
+            while stack:
+                element, depth = stack.pop()
                 
-            subtree_elements.add(element)
-            subtree_paths.add(element.getPath())
-            
-            for child in element.children:
-                stack.append((child, depth + 1))
+                if max_depth is not None and depth > max_depth:
+                    continue
+                    
+                subtree_elements.append(element)
+                
+                for child in element.children:
+                    stack.append((child, depth + 1))
         
-        result["subtree_elements"] = [
-            ElementConverter.element_to_dict(element) for element in subtree_elements
-        ]
+        # Membership by element identity avoids hashing path strings
+        subtree_ids = {id(element) for element in subtree_elements}
+        get_path = index.path_of
+        
+        result["subtree_elements"] = ElementConverter.elements_to_list(subtree_elements)
         
         # Analyze dependencies for each element in subtree
         for element in subtree_elements:
-            element_path = element.getPath()
+            element_path = get_path(element)
             
             # Analyze outgoing dependencies
             for association in element.outgoing:
-                target_path = association.toElement.getPath()
+                target = association.toElement
+                target_path = get_path(target)
                 
                 if not include_external and "/External/" in target_path:
                     continue
                 
-                dep_info = ElementConverter.association_to_dict(association)
+                dep_info = ElementConverter.association_to_dict(
+                    association, element_path, target_path
+                )
                 
-                if target_path in subtree_paths:
+                if id(target) in subtree_ids:
                     result["internal_dependencies"].append(dep_info)
                 else:
                     result["outgoing_dependencies"].append(dep_info)
             
             # Analyze incoming dependencies
             for association in element.incoming:
-                source_path = association.fromElement.getPath()
+                source = association.fromElement
+                if id(source) in subtree_ids:
+                    continue
                 
+                source_path = get_path(source)
                 if not include_external and "/External/" in source_path:
                     continue
                 
-                if source_path not in subtree_paths:
-                    dep_info = ElementConverter.association_to_dict(association)
-                    result["incoming_dependencies"].append(dep_info)
+                dep_info = ElementConverter.association_to_dict(
+                    association, source_path, element_path
+                )
+                result["incoming_dependencies"].append(dep_info)
         
         logger.debug(f"Subtree analysis complete: {len(subtree_elements)} elements, "
                     f"{len(result['internal_dependencies'])} internal deps, "
@@ -5,12 +5,24 @@ Handles model structure overview and hierarchical analysis.
 """
 
 import logging
-from typing import Dict, Any
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Tuple
+from weakref import WeakKeyDictionary
 
-from sgraph import SGraph, SElement
+from sgraph import SGraph
+
+from src.core.model_index import get_model_index
 
 logger = logging.getLogger(__name__)
 
+# Overviews kept per model (most recently used last). Models are not modified
+# after loading, and entries go away with the model itself.
+OVERVIEW_CACHE_SIZE = 8
+_overview_cache: "WeakKeyDictionary[SGraph, OrderedDict[Tuple[int, bool], Dict[str, Any]]]" = WeakKeyDictionary()
+# Overviews may be requested from several threads at once
+_overview_cache_lock = threading.Lock()
+
 
 class OverviewService:
     """Provides model overview functionality."""
@@ -21,74 +33,128 @@ class OverviewService:
         max_depth: int = 3,
         include_counts: bool = True,
     ) -> Dict[str, Any]:
-        """Get hierarchical overview of the model structure up to specified depth."""
-        logger.debug(f"Generating model overview: depth={max_depth}, counts={include_counts}")
-        
-        result = {
-            "root_path": "",
-            "max_depth": max_depth,
-            "tree_structure": {},
-            "summary": {
-                "total_elements": 0,
-                "depth_counts": {},
-                "type_distribution": {},
-            }
+        """Get hierarchical overview of the model structure up to specified depth.
+
+        Results are memoized per model and arguments; the returned dict, and
+        every dict nested in it, is shared between calls and must not be
+        modified. Callers that need to change it should work on a
+        ``copy.deepcopy``.
+        """
+        key = (max_depth, include_counts)
+        with _overview_cache_lock:
+            overviews = _overview_cache.get(model)
+            if overviews is None:
+                overviews = _overview_cache[model] = OrderedDict()
+            result = overviews.get(key)
+            if result is not None:
+                overviews.move_to_end(key)
+                return result
+
+        result = OverviewService._build_overview(model, max_depth, include_counts)
+        with _overview_cache_lock:
+            overviews[key] = result
+            if len(overviews) > OVERVIEW_CACHE_SIZE:
+                overviews.popitem(last=False)
+        return result
+
+    @staticmethod
+    def forget_model(model: SGraph) -> None:
+        """Drop the memoized overviews of a model (e.g. when it is removed)."""
+        with _overview_cache_lock:
+            if model in _overview_cache:
+                del _overview_cache[model]
+
+    @staticmethod
+    def get_model_overviews_multi(
+        model: SGraph,
+        depths: List[int],
+        include_counts: bool = True,
+    ) -> Dict[int, Dict[str, Any]]:
+        """Get overviews for several depths at once, keyed by depth.
+
+        The summaries for all depths come from the same per-depth totals of
+        the model index, computed in one pass. Each depth still gets its own
+        tree, memoized and shared like get_model_overview (so the same
+        read-only contract applies).
+        """
+        return {
+            depth: OverviewService.get_model_overview(model, depth, include_counts)
+            for depth in depths
         }
+
+    @staticmethod
+    def _build_overview(model: SGraph, max_depth: int, include_counts: bool) -> Dict[str, Any]:
+        """Traverse the model and build an overview (uncached)."""
+        logger.debug(f"Generating model overview: depth={max_depth}, counts={include_counts}")
         
         # Start from root element
         root_element = model.rootNode
-        total_elements = 0
-        depth_counts = {}
-        type_distribution = {}
         
-        def build_tree_structure(element: SElement, current_depth: int) -> Dict[str, Any]:
-            nonlocal total_elements
-            total_elements += 1
-            
-            # Track depth statistics
-            if current_depth not in depth_counts:
-                depth_counts[current_depth] = 0
-            depth_counts[current_depth] += 1
-            
-            # Track type distribution
-            element_type = element.getType() or "unknown"
-            if element_type not in type_distribution:
-                type_distribution[element_type] = 0
-            type_distribution[element_type] += 1
-            
-            # Build structure for this element
+        # The summary comes from the index's per-depth totals, so the walk
+        # below only builds the tree (which always includes the root)
+        depth_counts, type_counts = get_model_index(model).count_depths_and_types(max(max_depth, 0))
+        
+        # Iterative preorder walk (children pushed in reverse) so nodes, and thus
+        # the summary dicts, are visited in the same order as a recursive walk.
+        # Each entry carries the dict and key its structure is stored under.
+        # The walk visits exactly the counted elements, so it also records the
+        # order types first appear in, which type_distribution keeps.
+        holder = {None: None}
+        type_order = {}
+        stack = [(root_element, 0, root_element.getPath(), holder, None)]
+        while stack:
+            element, current_depth, path, siblings, key = stack.pop()
+            # Build structure for this element. The type is read from attrs
+            # directly (as the index does); the parser shares type strings.
+            element_type = element.attrs.get("type") or "unknown"
+            type_order[element_type] = None
             structure = {
                 "name": element.name,
-                "path": element.getPath(),
+                "path": path,
                 "type": element_type,
                 "depth": current_depth,
             }
+            siblings[key] = structure
             
+            children = element.children
             if include_counts:
-                structure["child_count"] = len(element.children)
+                structure["child_count"] = len(children)
                 structure["incoming_count"] = len(element.incoming)
                 structure["outgoing_count"] = len(element.outgoing)
             
             # Add children if we haven't reached max depth
             if current_depth < max_depth:
-                structure["children"] = {}
-                for child in element.children:
-                    child_name = child.name or f"<unnamed_{child.getType()}>"
-                    structure["children"][child_name] = build_tree_structure(child, current_depth + 1)
-            elif len(element.children) > 0:
+                child_structures = structure["children"] = {}
+                child_depth = current_depth + 1
+                # Child paths extend the parent path (same as child.getPath())
+                stack.extend(
+                    (child, child_depth, path + "/" + child.name, child_structures,
+                     child.name or f"<unnamed_{child.getType()}>")
+                    for child in reversed(children)
+                )
+            elif len(children) > 0:
                 # Indicate there are more children beyond max depth
-                structure["has_more_children"] = len(element.children)
-            
-            return structure
+                structure["has_more_children"] = len(children)
         
-        # Build the complete tree structure
-        root_structure = build_tree_structure(root_element, 0)
-        result["tree_structure"] = root_structure
+        total_elements = sum(depth_counts.values())
+        # Elements without a type are reported as "unknown", like in the tree
+        type_distribution = Counter()
+        for raw_type, count in type_counts.items():
+            type_distribution[raw_type or "unknown"] += count
+        type_distribution = {label: type_distribution[label] for label in type_order}
         
-        # Add summary statistics
-        result["summary"]["total_elements"] = total_elements
-        result["summary"]["depth_counts"] = depth_counts
-        result["summary"]["type_distribution"] = type_distribution
+        # The result is built once, in its final shape, and then shared by
+        # every call that hits the memo
+        result = {
+            "root_path": "",
+            "max_depth": max_depth,
+            "tree_structure": holder[None],
+            "summary": {
+                "total_elements": total_elements,
+                "depth_counts": depth_counts,
+                "type_distribution": type_distribution,
+            }
+        }
         
         logger.debug(f"Model overview complete: {total_elements} elements across {len(depth_counts)} depth levels")
         
@@ -4,27 +4,140 @@ Search service for sgraph elements.
 Handles various search operations on sgraph models.
 """
 
+import functools
+import itertools
+import operator
 import re
 import logging
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from sgraph import SGraph, SElement
-from src.utils.validators import validate_pattern
+from src.core.model_index import HYPERSCAN_AVAILABLE, get_model_index
+from src.utils.validators import compile_pattern, validate_pattern
 
 logger = logging.getLogger(__name__)
 
 
+_MISSING = object()
+
+
+def compile_attribute_predicate(attribute_filters: Dict[str, Any]) -> Callable[[SElement], bool]:
+    """Generate one predicate function that checks all attribute filters.
+
+    String filters are regexes searched in string attributes (exact match if the
+    regex is invalid); other values must compare equal. Regexes are compiled
+    once here, and the filter loop is unrolled into straight-line code.
+    """
+    namespace: Dict[str, Any] = {"_MISSING": _MISSING}
+    lines = ["def predicate(element):"]
+    for i, (attr_name, expected_value) in enumerate(attribute_filters.items()):
+        namespace[f"name_{i}"] = attr_name
+        namespace[f"expected_{i}"] = expected_value
+        lines += [
+            f"    value = getattr(element, name_{i}, _MISSING)",
+            "    if value is _MISSING:",
+            "        return False",
+        ]
+        regex = None
+        if isinstance(expected_value, str):
+            try:
+                regex = compile_pattern(expected_value)
+            except re.error:
+                pass
+        if regex is not None:
+            namespace[f"search_{i}"] = regex.search
+            lines += [
+                "    if isinstance(value, str):",
+                f"        if not search_{i}(value):",
+                "            return False",
+                f"    elif value != expected_{i}:",
+                "        return False",
+            ]
+        else:
+            lines += [
+                f"    if value != expected_{i}:",
+                "        return False",
+            ]
+    lines.append("    return True")
+
+    exec("\n".join(lines), namespace)
+    return namespace["predicate"]
+
+
+# Characters that make a pattern more than a plain literal
+_REGEX_METACHARACTERS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+def _literal_text(regex: re.Pattern) -> Optional[str]:
+    """Return the text of a pattern without metacharacters (a plain substring search)."""
+    pattern = regex.pattern
+    if (
+        isinstance(pattern, str)
+        and not regex.flags & (re.IGNORECASE | re.VERBOSE)
+        and not _REGEX_METACHARACTERS.search(pattern)
+    ):
+        return pattern
+    return None
+
+
+def _exact_name(regex: re.Pattern) -> Optional[str]:
+    """Return the name an anchored literal pattern such as ``^base\\.py$`` matches, if any."""
+    pattern = regex.pattern
+    if (
+        not isinstance(pattern, str)
+        or regex.flags & (re.IGNORECASE | re.MULTILINE | re.VERBOSE)
+        or len(pattern) < 2
+        or not pattern.startswith("^")
+        or not pattern.endswith("$")
+    ):
+        return None
+    body = pattern[1:-1]
+    if not _REGEX_METACHARACTERS.search(body):
+        return body
+    literal = re.sub(r"\\(.)", r"\1", body)
+    return literal if re.escape(literal) == body else None
+
+
+def _iter_subtree(element: SElement):
+    """Yield an element and its descendants in stack traversal order."""
+    stack = [element]
+    while stack:
+        element = stack.pop()
+        yield element
+        stack.extend(element.children)
+
+
+@functools.lru_cache(maxsize=512)
+def compile_name_pattern(pattern: str) -> re.Pattern:
+    """Compile a name search pattern (regex, else glob, else literal), cached per pattern."""
+    is_valid, error = validate_pattern(pattern)
+    if is_valid:
+        return compile_pattern(pattern)
+
+    logger.debug(f"Pattern is not valid regex, trying as glob: {error}")
+    # Convert glob-style pattern to regex
+    glob_pattern = re.escape(pattern).replace(r"\*", ".*").replace(r"\?", ".")
+    try:
+        return re.compile(glob_pattern)
+    except re.error:
+        # Final fallback to literal search
+        return re.compile(re.escape(pattern))
+
+
 class SearchService:
     """Provides search functionality for sgraph elements."""
     
     @staticmethod
     def search_elements_by_name(
         model: SGraph,
-        pattern: str,
+        pattern: Union[str, re.Pattern],
         element_type: Optional[str] = None,
         scope_path: Optional[str] = None,
     ) -> List[SElement]:
-        """Search for elements by name pattern within optional scope and type filters."""
+        """Search for elements by name pattern within optional scope and type filters.
+
+        ``pattern`` may also be a Pattern from compile_name_pattern().
+        """
         logger.debug(f"Searching elements by name: pattern='{pattern}', type='{element_type}', scope='{scope_path}'")
         
         results = []
@@ -36,33 +149,61 @@ class SearchService:
                 logger.warning(f"Scope path not found: {scope_path}")
                 return results
         
-        # Validate and compile pattern
-        is_valid, error = validate_pattern(pattern)
-        if not is_valid:
-            logger.debug(f"Pattern is not valid regex, trying as glob: {error}")
-            # Convert glob-style pattern to regex
-            glob_pattern = re.escape(pattern).replace(r"\*", ".*").replace(r"\?", ".")
-            try:
-                regex_pattern = re.compile(glob_pattern)
-            except re.error:
-                # Final fallback to literal search
-                regex_pattern = re.compile(re.escape(pattern))
+        if isinstance(pattern, re.Pattern):
+            regex_pattern = pattern
         else:
-            regex_pattern = re.compile(pattern)
-        
-        # Iterative traversal for performance
-        stack = [start_element]
-        while stack:
-            element = stack.pop()
-            
-            # Check if element matches pattern
-            if regex_pattern.search(element.name):
-                # Check type filter if specified
-                if element_type is None or element.getType() == element_type:
-                    results.append(element)
-            
-            # Add children to stack
-            stack.extend(element.children)
+            regex_pattern = compile_name_pattern(pattern)
+
+        index = get_model_index(model)
+        scope = index.scope_range(start_element)
+        if scope:
+            # The scope is a contiguous range of the index's flat columns; pick
+            # the cheapest way to find the matching positions in it
+            start, end = scope
+            names = index.names
+            exact_name = _exact_name(regex_pattern)
+            # Plain substrings are tested with str.__contains__ instead of the regex engine
+            literal = _literal_text(regex_pattern)
+            typed = None if element_type is None else index.find_types(element_type, start, end)
+            matches = None
+            if exact_name is not None:
+                # '$' also matches before a trailing newline
+                matches = index.find_names((exact_name, exact_name + "\n"), start, end)
+            elif typed is not None and (not HYPERSCAN_AVAILABLE or len(typed) * 4 < end - start):
+                # Few elements of the requested type: only test their names
+                if literal is not None:
+                    matches = [i for i in typed if literal in names[i]]
+                else:
+                    matches = [i for i in typed if regex_pattern.search(names[i])]
+            elif HYPERSCAN_AVAILABLE:
+                # All names are scanned in one pass
+                matches = index.search_names(regex_pattern, start, end)
+            if matches is None:
+                if len(index.name_positions) < end - start:
+                    # Test each distinct name once
+                    if literal is not None:
+                        matches = index.find_names_containing(literal, start, end)
+                    else:
+                        matches = index.find_names_matching(regex_pattern, start, end)
+                else:
+                    # map/compress keep the per-name test loop in C
+                    if literal is not None:
+                        tests = map(operator.contains, names[start:end], itertools.repeat(literal))
+                    else:
+                        tests = map(regex_pattern.search, names[start:end])
+                    matches = itertools.compress(range(start, end), tests)
+            elements, types = index.elements, index.types
+            results = [
+                elements[i] for i in matches
+                if element_type is None or types[i] == element_type
+            ]
+        else:
+            # Element outside the indexed tree; walk it directly
+            for element in _iter_subtree(start_element):
+                if regex_pattern.search(element.name):
+                    # Check type filter if specified
+                    if element_type is None or element.getType() == element_type:
+                        results.append(element)
         
         logger.debug(f"Found {len(results)} elements matching pattern")
         return results
@@ -85,15 +226,18 @@ class SearchService:
                 logger.warning(f"Scope path not found: {scope_path}")
                 return results
         
-        # Iterative traversal for performance
-        stack = [start_element]
-        while stack:
-            element = stack.pop()
-            
-            if element.getType() == element_type:
-                results.append(element)
-            
-            stack.extend(element.children)
+        # Compare the model index's flat types column over the scope's range
+        index = get_model_index(model)
+        scope = index.scope_range(start_element)
+        if scope:
+            elements = index.elements
+            results = [elements[i] for i in index.find_types(element_type, *scope)]
+        else:
+            # Element outside the indexed tree; walk it directly
+            results = [
+                element for element in _iter_subtree(start_element)
+                if element.getType() == element_type
+            ]
         
         logger.debug(f"Found {len(results)} elements of type '{element_type}'")
         return results
@@ -116,39 +260,26 @@ class SearchService:
                 logger.warning(f"Scope path not found: {scope_path}")
                 return results
         
-        # Iterative traversal for performance
-        stack = [start_element]
-        while stack:
-            element = stack.pop()
-            
-            # Check if element matches all attribute filters
-            matches_all = True
-            for attr_name, expected_value in attribute_filters.items():
-                if not hasattr(element, attr_name):
-                    matches_all = False
-                    break
-                
-                actual_value = getattr(element, attr_name)
-                
-                # Support regex matching for string attributes
-                if isinstance(expected_value, str) and isinstance(actual_value, str):
-                    try:
-                        if not re.search(expected_value, actual_value):
-                            matches_all = False
-                            break
-                    except re.error:
-                        # Fallback to exact match
-                        if actual_value != expected_value:
-                            matches_all = False
-                            break
-                elif actual_value != expected_value:
-                    matches_all = False
-                    break
-            
-            if matches_all:
-                results.append(element)
-            
-            stack.extend(element.children)
+        results = SearchService.search_with_predicate(
+            model, compile_attribute_predicate(attribute_filters), start_element
+        )
         
         logger.debug(f"Found {len(results)} elements matching attributes")
         return results
+
+    @staticmethod
+    def search_with_predicate(
+        model: SGraph,
+        predicate: Callable[[SElement], bool],
+        start_element: Optional[SElement] = None,
+    ) -> List[SElement]:
+        """Return the elements under ``start_element`` (default: root) accepted by ``predicate``."""
+        if start_element is None:
+            start_element = model.rootNode
+        
+        # The index holds the scope as a contiguous slice; no tree walk needed
+        candidates = get_model_index(model).subtree(start_element)
+        if candidates is None:
+            candidates = _iter_subtree(start_element)
+        
+        return list(filter(predicate, candidates))
@@ -1,18 +1,73 @@
 import asyncio
+import functools
+import itertools
+import operator
 import re
 import logging
 import time
 import os
-from typing import Any, Optional
+from collections import Counter
+from typing import Any, Callable, Iterable, Optional
 
 import nanoid
-from sgraph import SElement, SGraph
+from sgraph import SElement, SElementAssociation, SGraph
 from sgraph.loader.modelloader import ModelLoader
 
+from src.core.model_index import (
+    HYPERSCAN_AVAILABLE,
+    ModelIndex,
+    build_model_index,
+    get_model_index,
+)
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Above this many paths, get_multiple_elements resolves them with one trie walk
+BATCH_LOOKUP_THRESHOLD = 32
+
+_MISSING = object()
+
+# Associations share one class, so decide once how to read their type instead
+# of paying for getattr's default handling on every edge.
+if hasattr(SElementAssociation, "type"):
+    _association_type = operator.attrgetter("type")
+else:
+    def _association_type(association: SElementAssociation) -> str:
+        return "unknown"
+
+
+@functools.lru_cache(maxsize=64)
+def _make_element_to_dict(additional_fields: tuple[str, ...]):
+    """Generate an element_to_dict specialized for a fixed tuple of additional fields.
+
+    The field loop is unrolled at generation time, so each call does one
+    getattr per field instead of iterating and probing with hasattr.
+    """
+    lines = [
+        "def element_to_dict(element, path):",
+        "    if path is None:",
+        "        path = element.getPath()",
+        "    result = {",
+        "        'name': element.name,",
+        "        'path': path,",
+        "        'type': element.getType(),",
+        "        'child_paths': [path + '/' + child.name for child in element.children],",
+        "    }",
+    ]
+    for field in additional_fields:
+        lines += [
+            f"    value = getattr(element, {field!r}, _MISSING)",
+            "    if value is not _MISSING:",
+            f"        result[{field!r}] = value",
+        ]
+    lines.append("    return result")
+
+    namespace = {"_MISSING": _MISSING}
+    exec("\n".join(lines), namespace)
+    return namespace["element_to_dict"]
+
 
 class SGraphHelper:
     _models: dict[str, SGraph] = {}
@@ -24,17 +79,17 @@ class SGraphHelper:
 
     async def load_sgraph(self, path: str) -> str:
         """Load a sgraph model with comprehensive logging and error handling."""
-        logger.info(f"🔍 Starting to load model from: {path}")
+        logger.info("🔍 Starting to load model from: %s", path)
         
         # Validate file exists
         if not os.path.exists(path):
             error_msg = f"Model file does not exist: {path}"
-            logger.error(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             raise FileNotFoundError(error_msg)
         
         # Check file size for logging
         file_size = os.path.getsize(path)
-        logger.info(f"📁 File size: {file_size / (1024*1024):.1f} MB")
+        logger.info("📁 File size: %.1f MB", file_size / (1024*1024))
         
         start_time = time.perf_counter()
 
@@ -45,8 +100,8 @@ class SGraphHelper:
             logger.info("🔒 Waiting for model load lock...")
             async with self._load_lock:
                 lock_acquired_time = time.perf_counter()
-                logger.info(f"🔓 Model load lock acquired after {lock_acquired_time - start_time:.3f}s")
-                logger.info(f"⏳ Loading model using ModelLoader (timeout 60s)...")
+                logger.info("🔓 Model load lock acquired after %.3fs", lock_acquired_time - start_time)
+                logger.info("⏳ Loading model using ModelLoader (timeout 60s)...")
                 # Use asyncio.to_thread with timeout to prevent hanging
                 model = await asyncio.wait_for(
                     asyncio.to_thread(self.ml.load_model, path),
@@ -54,7 +109,7 @@ class SGraphHelper:
                 )
         except asyncio.TimeoutError:
             error_msg = f"Model loading timed out after 60 seconds: {path}"
-            logger.error(f"⏰ {error_msg}")
+            logger.error("⏰ %s", error_msg)
             raise TimeoutError(error_msg)
         except Exception as e:
             load_time = time.perf_counter() - start_time
@@ -62,24 +117,28 @@ class SGraphHelper:
                 f"Failed to load model after {load_time:.2f} seconds: {e} "
                 f"(type={type(e).__name__})"
             )
-            logger.error(f"💥 {error_msg}")
+            logger.error("💥 %s", error_msg)
             raise RuntimeError(error_msg) from e
 
         load_time = time.perf_counter() - start_time
-        logger.info(f"✅ Model loaded successfully in {load_time:.2f} seconds")
+        logger.info("✅ Model loaded successfully in %.2f seconds", load_time)
+
+        # Build the name index off the event loop, before the model is handed out
+        index = await asyncio.to_thread(build_model_index, model)
+        logger.info("🗂️ Model index built for %d elements", len(index))
 
         # Generate unique model ID
         model_id = nanoid.generate(size=24)
-        logger.info(f"🆔 Generated model ID: {model_id}")
+        logger.info("🆔 Generated model ID: %s", model_id)
 
         # Store model in memory cache
         self._models[model_id] = model
-        logger.info(f"💾 Model cached in memory (total models: {len(self._models)})")
+        logger.info("💾 Model cached in memory (total models: %d)", len(self._models))
 
         # Log basic model info
-        if hasattr(model, 'rootNode') and model.rootNode:
-            logger.info(f"🌳 Model root: {model.rootNode.name if model.rootNode.name else 'unnamed'}")
-            logger.info(f"👶 Root children: {len(model.rootNode.children)}")
+        if logger.isEnabledFor(logging.INFO) and getattr(model, 'rootNode', None):
+            logger.info("🌳 Model root: %s", model.rootNode.name or 'unnamed')
+            logger.info("👶 Root children: %d", len(model.rootNode.children))
 
         return model_id
 
@@ -90,18 +149,11 @@ class SGraphHelper:
         self,
         element: SElement,
         additional_fields: list[str] = [],
+        path: Optional[str] = None,
     ) -> dict[str, Any]:
-        return {
-            "name": element.name,
-            "path": element.getPath(),
-            "type": element.getType(),
-            "child_paths": [child.getPath() for child in element.children],
-            **{
-                field: getattr(element, field)
-                for field in additional_fields
-                if hasattr(element, field)
-            },
-        }
+        # Callers that already know the path pass it in; child paths extend it
+        # directly instead of walking each child's parent chain via getPath().
+        return _make_element_to_dict(tuple(additional_fields))(element, path)
 
     def search_elements_by_name(
         self,
@@ -127,6 +179,36 @@ class SGraphHelper:
             # Fallback to simple glob-style matching
             glob_pattern = pattern.replace("*", ".*").replace("?", ".")
             regex_pattern = re.compile(glob_pattern)
+
+        # Literal patterns are substring matches; answer them from the name index
+        # (distinct names only) once it has been built
+        if re.escape(pattern) == pattern:
+            index = get_model_index(model, build=False)
+            scope = index.scope_range(start_element) if index else None
+            if scope:
+                return self._indexed_elements(
+                    index, index.find_names_containing(pattern, *scope), element_type
+                )
+
+        # With Hyperscan installed, scan all names in one pass over a flat buffer
+        if HYPERSCAN_AVAILABLE:
+            index = get_model_index(model)
+            scope = index.scope_range(start_element)
+            matches = index.search_names(regex_pattern, *scope) if scope else None
+            if matches is not None:
+                return self._indexed_elements(index, matches, element_type)
+
+        # Once the index is built, scan its flat names column for the scope's
+        # preorder range; map/compress keep the per-name loop in C.
+        index = get_model_index(model, build=False)
+        scope = index.scope_range(start_element) if index else None
+        if scope:
+            start, end = scope
+            matches = itertools.compress(
+                range(start, end),
+                map(regex_pattern.search, index.names[start:end]),
+            )
+            return self._indexed_elements(index, matches, element_type)
         
         stack = [start_element]
         while stack:
@@ -139,6 +221,25 @@ class SGraphHelper:
         
         return results
 
+    @staticmethod
+    def _path_getter(model: SGraph) -> Callable[[SElement], str]:
+        """Return a path function that reuses the model index's path cache when built."""
+        index = get_model_index(model, build=False)
+        return index.path_of if index else SElement.getPath
+
+    @staticmethod
+    def _indexed_elements(
+        index: ModelIndex,
+        matches: Iterable[int],
+        element_type: Optional[str] = None,
+    ) -> list[SElement]:
+        """Resolve index positions to elements, filtering on the types column."""
+        elements = index.elements
+        if element_type is None:
+            return [elements[i] for i in matches]
+        types = index.types
+        return [elements[i] for i in matches if types[i] == element_type]
+
     def get_elements_by_type(
         self,
         model: SGraph,
@@ -155,6 +256,13 @@ class SGraphHelper:
             if start_element is None:
                 return results
         
+        # Once the index is built, compare its types column over the scope's range
+        index = get_model_index(model, build=False)
+        scope = index.scope_range(start_element) if index else None
+        if scope:
+            elements = index.elements
+            return [elements[i] for i in index.find_types(element_type, *scope)]
+
         # Use iterative stack-based traversal for better performance
         stack = [start_element]
         while stack:
@@ -224,13 +332,20 @@ class SGraphHelper:
         root_path: str,
         include_external: bool = True,
         max_depth: Optional[int] = None,
+        max_elements: Optional[int] = None,
     ) -> dict[str, Any]:
-        """Get all dependencies within a subtree, including both incoming and outgoing."""
+        """Get all dependencies within a subtree, including both incoming and outgoing.
+
+        By default the result is complete. Callers may cap the subtree elements
+        collected with ``max_elements``; ``truncated`` is set when the subtree
+        was larger than that.
+        """
         result = {
             "subtree_elements": [],
             "internal_dependencies": [],  # Dependencies within the subtree
             "incoming_dependencies": [],  # Dependencies from outside into subtree
             "outgoing_dependencies": [],  # Dependencies from subtree to outside
+            "truncated": False,
         }
         
         # Find the root element
@@ -238,70 +353,97 @@ class SGraphHelper:
         if root_element is None:
             return result
         
-        # Collect all elements in the subtree using stack-based traversal
-        subtree_elements = set()
-        subtree_paths = set()
-        
-        stack = [(root_element, 0)]  # (element, depth)
+        # Collect all elements in the subtree using stack-based traversal.
+        # Paths are built from the parent's path while descending, and membership
+        # is tracked by element identity so classification never hashes path strings.
+        subtree_elements = []
+        elem_to_path: dict[int, str] = {}
+
+        get_path = self._path_getter(model)
+        stack = [(root_element, 0, get_path(root_element))]  # (element, depth, path)
         while stack:
-            element, depth = stack.pop()
+            element, depth, element_path = stack.pop()
             
             if max_depth is not None and depth > max_depth:
                 continue
+
+            if max_elements is not None and len(subtree_elements) >= max_elements:
+                result["truncated"] = True
+                break
                 
-            subtree_elements.add(element)
-            subtree_paths.add(element.getPath())
+            subtree_elements.append(element)
+            elem_to_path[id(element)] = element_path
             
             # Add children to stack
             for child in element.children:
-                stack.append((child, depth + 1))
+                stack.append((child, depth + 1, element_path + "/" + child.name))
         
         # Convert elements to dictionaries for result
         result["subtree_elements"] = [
-            self.element_to_dict(element) for element in subtree_elements
+            self.element_to_dict(element, path=elem_to_path[id(element)])
+            for element in subtree_elements
         ]
         
-        # Analyze dependencies for each element in the subtree
+        # Analyze dependencies for each element in the subtree. Paths of elements
+        # outside the subtree are computed lazily, once per element.
+        outside_paths: dict[int, str] = {}
+
         for element in subtree_elements:
-            element_path = element.getPath()
+            element_path = elem_to_path[id(element)]
             
             # Check outgoing associations
             for association in element.outgoing:
-                target_path = association.toElement.getPath()
+                target = association.toElement
+                target_id = id(target)
+                target_path = elem_to_path.get(target_id)
+
+                if target_path is not None:
+                    # Internal dependency (within subtree); path already known
+                    if include_external or "/External/" not in target_path:
+                        result["internal_dependencies"].append({
+                            "from": element_path,
+                            "to": target_path,
+                            "type": _association_type(association),
+                        })
+                    continue
+
+                target_path = outside_paths.get(target_id)
+                if target_path is None:
+                    target_path = outside_paths[target_id] = get_path(target)
                 
                 # Skip external dependencies if not requested
                 if not include_external and "/External/" in target_path:
                     continue
                 
-                dep_info = {
+                # Outgoing dependency (subtree -> outside)
+                result["outgoing_dependencies"].append({
                     "from": element_path,
                     "to": target_path,
-                    "type": getattr(association, 'type', 'unknown'),
-                }
-                
-                if target_path in subtree_paths:
-                    # Internal dependency (within subtree)
-                    result["internal_dependencies"].append(dep_info)
-                else:
-                    # Outgoing dependency (subtree -> outside)
-                    result["outgoing_dependencies"].append(dep_info)
+                    "type": _association_type(association),
+                })
             
             # Check incoming associations
             for association in element.incoming:
-                source_path = association.fromElement.getPath()
+                source = association.fromElement
+                source_id = id(source)
+                if source_id in elem_to_path:
+                    # Already recorded as internal from the source's side
+                    continue
+                source_path = outside_paths.get(source_id)
+                if source_path is None:
+                    source_path = outside_paths[source_id] = get_path(source)
                 
                 # Skip external dependencies if not requested
                 if not include_external and "/External/" in source_path:
                     continue
                 
-                if source_path not in subtree_paths:
-                    # Incoming dependency (outside -> subtree)
-                    dep_info = {
-                        "from": source_path,
-                        "to": element_path,
-                        "type": getattr(association, 'type', 'unknown'),
-                    }
-                    result["incoming_dependencies"].append(dep_info)
+                # Incoming dependency (outside -> subtree)
+                dep_info = {
+                    "from": source_path,
+                    "to": element_path,
+                    "type": _association_type(association),
+                }
+                result["incoming_dependencies"].append(dep_info)
         
         return result
 
@@ -311,14 +453,20 @@ class SGraphHelper:
         element_path: str,
         direction: str = "outgoing",  # "outgoing", "incoming", or "both"
         max_depth: Optional[int] = None,
+        max_elements: Optional[int] = None,
     ) -> dict[str, Any]:
-        """Get transitive dependency chain from an element."""
+        """Get transitive dependency chain from an element.
+
+        By default the chain is complete. With ``max_elements``, traversal stops
+        once that many dependencies have been recorded and ``truncated`` is set.
+        """
         result = {
             "root_element": element_path,
             "direction": direction,
             "max_depth": max_depth,
             "chain": [],
             "all_dependencies": [],
+            "truncated": False,
         }
         
         # Find the root element
@@ -328,12 +476,15 @@ class SGraphHelper:
         
         visited = set()
         chain_elements = []
+        get_path = self._path_getter(model)
         
         def traverse_dependencies(element: SElement, depth: int, path: list[str]):
             if max_depth is not None and depth > max_depth:
                 return
+            if result["truncated"]:
+                return
             
-            element_path = element.getPath()
+            element_path = get_path(element)
             if element_path in visited:
                 return  # Avoid cycles
             
@@ -343,14 +494,18 @@ class SGraphHelper:
             # Get associations based on direction
             associations = []
             if direction in ["outgoing", "both"]:
-                associations.extend([(assoc.toElement, "outgoing", getattr(assoc, 'type', 'unknown')) 
+                associations.extend([(assoc.toElement, "outgoing", _association_type(assoc)) 
                                   for assoc in element.outgoing])
             if direction in ["incoming", "both"]:
-                associations.extend([(assoc.fromElement, "incoming", getattr(assoc, 'type', 'unknown')) 
+                associations.extend([(assoc.fromElement, "incoming", _association_type(assoc)) 
                                   for assoc in element.incoming])
             
             for target_element, dep_direction, dep_type in associations:
-                target_path = target_element.getPath()
+                if max_elements is not None and len(result["all_dependencies"]) >= max_elements:
+                    result["truncated"] = True
+                    break
+
+                target_path = get_path(target_element)
                 
                 # Record the dependency
                 result["all_dependencies"].append({
@@ -390,18 +545,68 @@ class SGraphHelper:
             "elements": [],
             "not_found": [],
         }
-        
+
+        # Large batches resolve all paths in one walk instead of N root-to-leaf lookups
+        if len(element_paths) > BATCH_LOOKUP_THRESHOLD:
+            found = self._find_elements_from_paths(model, element_paths)
+        else:
+            found = None
+        get_path = self._path_getter(model)
+
         for path in element_paths:
-            element = model.findElementFromPath(path)
+            if found is None:
+                element = model.findElementFromPath(path)
+            else:
+                element = found.get(path)
             if element is None:
                 result["not_found"].append(path)
             else:
-                element_dict = self.element_to_dict(element, additional_fields)
+                element_dict = self.element_to_dict(
+                    element, additional_fields, path=get_path(element)
+                )
                 result["elements"].append(element_dict)
                 result["found_count"] += 1
         
         return result
 
+    def _find_elements_from_paths(
+        self,
+        model: SGraph,
+        element_paths: list[str],
+    ) -> dict[str, SElement]:
+        """Resolve many element paths with a single walk over a trie of their segments."""
+        found: dict[str, SElement] = {}
+
+        # Build a trie of path segments; the None key marks paths ending at a node
+        trie: dict = {}
+        for path in element_paths:
+            relative = path[1:] if path.startswith("/") else path
+            if "//" in relative:
+                # Keep findElementFromPath's handling of empty segments
+                element = model.findElementFromPath(path)
+                if element is not None:
+                    found[path] = element
+                continue
+            node = trie
+            for segment in relative.split("/"):
+                node = node.setdefault(segment, {})
+            node.setdefault(None, []).append(path)
+
+        # Descend model and trie in parallel, following only requested branches
+        stack = [(model.rootNode, trie)]
+        while stack:
+            element, node = stack.pop()
+            for segment, child_node in node.items():
+                if segment is None:
+                    for path in child_node:
+                        found[path] = element
+                    continue
+                child = element.childrenDict.get(segment)
+                if child is not None:
+                    stack.append((child, child_node))
+
+        return found
+
     def get_model_overview(
         self,
         model: SGraph,
@@ -423,22 +628,16 @@ class SGraphHelper:
         # Start from root element
         root_element = model.rootNode
         total_elements = 0
-        depth_counts = {}
-        type_distribution = {}
+        depth_counts = Counter()
+        type_distribution = Counter()
         
         def build_tree_structure(element: SElement, current_depth: int) -> dict[str, Any]:
             nonlocal total_elements
             total_elements += 1
             
-            # Track depth statistics
-            if current_depth not in depth_counts:
-                depth_counts[current_depth] = 0
+            # Track depth statistics and type distribution
             depth_counts[current_depth] += 1
-            
-            # Track type distribution
             element_type = element.getType() or "unknown"
-            if element_type not in type_distribution:
-                type_distribution[element_type] = 0
             type_distribution[element_type] += 1
             
             # Build structure for this element
@@ -472,8 +671,8 @@ class SGraphHelper:
         
         # Add summary statistics
         result["summary"]["total_elements"] = total_elements
-        result["summary"]["depth_counts"] = depth_counts
-        result["summary"]["type_distribution"] = type_distribution
+        result["summary"]["depth_counts"] = dict(depth_counts)
+        result["summary"]["type_distribution"] = dict(type_distribution)
         
         return result
 
@@ -24,8 +24,16 @@ class SGraphGetModelOverview(BaseModel):
     include_counts: bool = True
 
 
+def _forget_overviews(model_id: str) -> None:
+    """Drop memoized overviews of a model that is being removed (unless still in use)."""
+    model = model_manager.get_model(model_id)
+    if model is not None and not model_manager.is_held_elsewhere(model):
+        OverviewService.forget_model(model)
+
+
 def register_tools(mcp):
     """Register model tools with the MCP server."""
+    model_manager.on_model_removed(_forget_overviews)
     
     @mcp.tool()
     async def sgraph_load_model(sgraph_load_model: SGraphLoadModel):
@@ -34,12 +42,14 @@ def register_tools(mcp):
             print(f"🔧 MCP Tool: sgraph_load_model called with path: {sgraph_load_model.path}")
             
             # Validate path
-            is_valid, error = validate_path(sgraph_load_model.path, must_exist=True)
+            is_valid, error, stat_result = validate_path(
+                sgraph_load_model.path, must_exist=True, root=model_manager.model_root
+            )
             if not is_valid:
                 print(f"❌ MCP Tool: Invalid path - {error}")
                 return {"error": f"Invalid path: {error}"}
             
-            model_id = await model_manager.load_model(sgraph_load_model.path)
+            model_id = await model_manager.load_model(sgraph_load_model.path, stat_result)
             print(f"✅ MCP Tool: Model loaded successfully with ID: {model_id}")
             return {"model_id": model_id}
             
@@ -71,6 +81,8 @@ def register_tools(mcp):
                 sgraph_get_model_overview.max_depth,
                 sgraph_get_model_overview.include_counts,
             )
+            # The memoized overview is shared; FastMCP only reads it while
+            # serializing the response, so it is returned as-is
             return result
         except Exception as e:
             return {"error": f"Model overview failed: {str(e)}"}
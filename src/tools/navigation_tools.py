@@ -4,11 +4,39 @@ Navigation-related MCP tools.
 Tools for getting specific elements and traversing the model structure.
 """
 
+from typing import Dict, List, Optional, Tuple
+
 from pydantic import BaseModel
+from sgraph import SElement, SGraph
 
 from src.core.element_converter import ElementConverter
 from .model_tools import get_model_manager
 
+# Resolved elements keyed by (model_id, element_path); entries for a model are
+# dropped when the model manager removes it.
+_ELEMENT_CACHE_SIZE = 10_000
+_element_cache: Dict[Tuple[str, str], SElement] = {}
+
+
+def _find_element(model_id: str, model: SGraph, element_path: str) -> Optional[SElement]:
+    """findElementFromPath with memoization of successful lookups."""
+    key = (model_id, element_path)
+    element = _element_cache.get(key)
+    if element is None:
+        element = model.findElementFromPath(element_path)
+        if element is not None:
+            if len(_element_cache) >= _ELEMENT_CACHE_SIZE:
+                # Evict the oldest entry
+                del _element_cache[next(iter(_element_cache))]
+            _element_cache[key] = element
+    return element
+
+
+def _forget_model(model_id: str) -> None:
+    """Drop cached elements of a removed model."""
+    for key in [key for key in _element_cache if key[0] == model_id]:
+        del _element_cache[key]
+
 
 class SGraphGetRootElement(BaseModel):
     model_id: str
@@ -29,11 +57,21 @@ class SGraphGetElementOutgoingAssociations(BaseModel):
     element_path: str
 
 
+class SGraphGetElementsBatch(BaseModel):
+    model_id: str
+    paths: List[str]
+
+
 def register_tools(mcp):
-    """Register navigation tools with the MCP server."""
+    """Register navigation tools with the MCP server.
+
+    These tools only do cached lookups, so they are plain functions that
+    FastMCP calls directly rather than coroutines.
+    """
+    get_model_manager().on_model_removed(_forget_model)
     
     @mcp.tool()
-    async def sgraph_get_root_element(sgraph_get_root_element: SGraphGetRootElement):
+    def sgraph_get_root_element(sgraph_get_root_element: SGraphGetRootElement):
         """Get the root element from a model."""
         model_manager = get_model_manager()
         model = model_manager.get_model(sgraph_get_root_element.model_id)
@@ -47,30 +85,33 @@ def register_tools(mcp):
         return ElementConverter.element_to_dict(root_element)
 
     @mcp.tool()
-    async def sgraph_get_element(sgraph_get_element: SGraphGetElement):
+    def sgraph_get_element(sgraph_get_element: SGraphGetElement):
         """Get an element from a model by the path."""
         model_manager = get_model_manager()
         model = model_manager.get_model(sgraph_get_element.model_id)
         if model is None:
             return {"error": "Model not loaded"}
         
-        element = model.findElementFromPath(sgraph_get_element.element_path)
+        element = _find_element(sgraph_get_element.model_id, model, sgraph_get_element.element_path)
         if element is None:
             return {"error": "Element not found"}
         
         return ElementConverter.element_to_dict(element)
 
     @mcp.tool()
-    async def sgraph_get_element_incoming_associations(
+    def sgraph_get_element_incoming_associations(
         sgraph_get_element_incoming_associations: SGraphGetElementIncomingAssociations,
     ):
         """Get the incoming associations of single element. Does not include the associations of the children."""
         model_manager = get_model_manager()
-        model = model_manager.get_model(sgraph_get_element_incoming_associations.model_id)
+        model_id = sgraph_get_element_incoming_associations.model_id
+        model = model_manager.get_model(model_id)
         if model is None:
             return {"error": "Model not loaded"}
         
-        element = model.findElementFromPath(sgraph_get_element_incoming_associations.element_path)
+        element = _find_element(
+            model_id, model, sgraph_get_element_incoming_associations.element_path
+        )
         if element is None:
             return {"error": "Element not found"}
         
@@ -85,16 +126,19 @@ def register_tools(mcp):
         }
 
     @mcp.tool()
-    async def sgraph_get_element_outgoing_associations(
+    def sgraph_get_element_outgoing_associations(
         sgraph_get_element_outgoing_associations: SGraphGetElementOutgoingAssociations,
     ):
         """Get the outgoing associations of single element. Does not include the associations of the children."""
         model_manager = get_model_manager()
-        model = model_manager.get_model(sgraph_get_element_outgoing_associations.model_id)
+        model_id = sgraph_get_element_outgoing_associations.model_id
+        model = model_manager.get_model(model_id)
         if model is None:
             return {"error": "Model not loaded"}
         
-        element = model.findElementFromPath(sgraph_get_element_outgoing_associations.element_path)
+        element = _find_element(
+            model_id, model, sgraph_get_element_outgoing_associations.element_path
+        )
         if element is None:
             return {"error": "Element not found"}
         
@@ -106,4 +150,31 @@ def register_tools(mcp):
             "element_path": sgraph_get_element_outgoing_associations.element_path,
             "outgoing_associations": associations,
             "count": len(associations),
-        }
\ No newline at end of file
+        }
+
+    @mcp.tool()
+    def sgraph_get_elements_batch(sgraph_get_elements_batch: SGraphGetElementsBatch):
+        """Get many elements from a model by path in one call.
+
+        Paths that do not resolve are listed in not_found.
+        """
+        model_manager = get_model_manager()
+        model_id = sgraph_get_elements_batch.model_id
+        model = model_manager.get_model(model_id)
+        if model is None:
+            return {"error": "Model not loaded"}
+        
+        elements = []
+        not_found = []
+        for path in sgraph_get_elements_batch.paths:
+            element = _find_element(model_id, model, path)
+            if element is None:
+                not_found.append(path)
+            else:
+                elements.append(element)
+        
+        return {
+            "elements": ElementConverter.elements_to_list(elements),
+            "not_found": not_found,
+            "count": len(elements),
+        }
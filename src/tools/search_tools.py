@@ -4,59 +4,111 @@ Search-related MCP tools.
 Tools for searching elements by name, type, and attributes.
 """
 
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+import asyncio
 
-from src.services.search_service import SearchService
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
+
+from src.services.search_service import SearchService, compile_name_pattern
 from src.core.element_converter import ElementConverter
+from src.core.result_cache import ResultCache
 from .model_tools import get_model_manager
 
+# Identical searches against the same model return cached results
+_result_cache = ResultCache(maxsize=1024, ttl=300)
+# Full match lists, shared by every page of the same search
+_match_cache = ResultCache(maxsize=256, ttl=300)
+
+
+class PagedSearch(BaseModel):
+    """Paging options shared by the search tools; by default all results are returned."""
+    offset: int = Field(default=0, ge=0)
+    limit: Optional[int] = Field(default=None, ge=1)
 
-class SGraphSearchElementsByName(BaseModel):
+
+class SGraphSearchElementsByName(PagedSearch):
     model_id: str
     pattern: str
     element_type: Optional[str] = None
     scope_path: Optional[str] = None
 
 
-class SGraphGetElementsByType(BaseModel):
+class SGraphGetElementsByType(PagedSearch):
     model_id: str
     element_type: str
     scope_path: Optional[str] = None
 
 
-class SGraphSearchElementsByAttributes(BaseModel):
+class SGraphSearchElementsByAttributes(PagedSearch):
     model_id: str
     attribute_filters: Dict[str, Any]
     scope_path: Optional[str] = None
 
 
+async def _find_all(tool_name: str, args: PagedSearch, search, *search_args) -> List:
+    """Run a search off the event loop, or reuse its matches from an earlier page."""
+    key = ResultCache.make_key(tool_name, args.model_id, args.model_dump(exclude={"offset", "limit"}))
+    elements = _match_cache.get(key)
+    if elements is None:
+        # Full-model scans are CPU-bound; run them off the event loop
+        elements = await asyncio.to_thread(search, *search_args)
+        _match_cache.set(key, elements)
+    return elements
+
+
+def _paged_result(elements: List, paging: PagedSearch) -> Dict[str, Any]:
+    """Convert one page of search results; only that page is turned into dicts."""
+    total = len(elements)
+    end = total if paging.limit is None else min(paging.offset + paging.limit, total)
+    element_dicts = ElementConverter.elements_to_list(elements[paging.offset:end])
+    return {
+        "elements": element_dicts,
+        "count": len(element_dicts),
+        "total_count": total,
+        "next_offset": end if end < total else None,
+    }
+
+
 def register_tools(mcp):
     """Register search tools with the MCP server."""
+    get_model_manager().on_model_removed(_result_cache.invalidate_model)
+    get_model_manager().on_model_removed(_match_cache.invalidate_model)
     
     @mcp.tool()
     async def sgraph_search_elements_by_name(
         sgraph_search_elements_by_name: SGraphSearchElementsByName,
     ):
-        """Search for elements by name pattern (regex or glob). Optionally filter by element type and scope path."""
+        """Search for elements by name pattern (regex or glob). Optionally filter by element type and scope path. Use offset/limit to page through large results; next_offset is set while more remain."""
         model_manager = get_model_manager()
         model = model_manager.get_model(sgraph_search_elements_by_name.model_id)
         if model is None:
             return {"error": "Model not loaded"}
         
+        cache_key = ResultCache.make_key(
+            "sgraph_search_elements_by_name",
+            sgraph_search_elements_by_name.model_id,
+            sgraph_search_elements_by_name.model_dump(),
+        )
+        cached = _result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            elements = SearchService.search_elements_by_name(
+            # Repeated queries reuse the cached compiled pattern
+            pattern = compile_name_pattern(sgraph_search_elements_by_name.pattern)
+            elements = await _find_all(
+                "sgraph_search_elements_by_name",
+                sgraph_search_elements_by_name,
+                SearchService.search_elements_by_name,
                 model,
-                sgraph_search_elements_by_name.pattern,
+                pattern,
                 sgraph_search_elements_by_name.element_type,
                 sgraph_search_elements_by_name.scope_path,
             )
-            element_dicts = ElementConverter.elements_to_list(elements)
-            return {
-                "elements": element_dicts,
-                "count": len(element_dicts),
-                "pattern": sgraph_search_elements_by_name.pattern,
-            }
+            result = _paged_result(elements, sgraph_search_elements_by_name)
+            result["pattern"] = sgraph_search_elements_by_name.pattern
+            _result_cache.set(cache_key, result)
+            return result
         except Exception as e:
             return {"error": f"Search failed: {str(e)}"}
 
@@ -64,24 +116,34 @@ def register_tools(mcp):
     async def sgraph_get_elements_by_type(
         sgraph_get_elements_by_type: SGraphGetElementsByType,
     ):
-        """Get all elements of a specific type. Optionally limit search to a scope path."""
+        """Get all elements of a specific type. Optionally limit search to a scope path. Use offset/limit to page through large results; next_offset is set while more remain."""
         model_manager = get_model_manager()
         model = model_manager.get_model(sgraph_get_elements_by_type.model_id)
         if model is None:
             return {"error": "Model not loaded"}
         
+        cache_key = ResultCache.make_key(
+            "sgraph_get_elements_by_type",
+            sgraph_get_elements_by_type.model_id,
+            sgraph_get_elements_by_type.model_dump(),
+        )
+        cached = _result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            elements = SearchService.get_elements_by_type(
+            elements = await _find_all(
+                "sgraph_get_elements_by_type",
+                sgraph_get_elements_by_type,
+                SearchService.get_elements_by_type,
                 model,
                 sgraph_get_elements_by_type.element_type,
                 sgraph_get_elements_by_type.scope_path,
             )
-            element_dicts = ElementConverter.elements_to_list(elements)
-            return {
-                "elements": element_dicts,
-                "count": len(element_dicts),
-                "element_type": sgraph_get_elements_by_type.element_type,
-            }
+            result = _paged_result(elements, sgraph_get_elements_by_type)
+            result["element_type"] = sgraph_get_elements_by_type.element_type
+            _result_cache.set(cache_key, result)
+            return result
         except Exception as e:
             return {"error": f"Search failed: {str(e)}"}
 
@@ -89,23 +151,33 @@ def register_tools(mcp):
     async def sgraph_search_elements_by_attributes(
         sgraph_search_elements_by_attributes: SGraphSearchElementsByAttributes,
     ):
-        """Search for elements by attribute values. attribute_filters is a dict of attribute_name -> expected_value."""
+        """Search for elements by attribute values. attribute_filters is a dict of attribute_name -> expected_value. Use offset/limit to page through large results; next_offset is set while more remain."""
         model_manager = get_model_manager()
         model = model_manager.get_model(sgraph_search_elements_by_attributes.model_id)
         if model is None:
             return {"error": "Model not loaded"}
         
+        cache_key = ResultCache.make_key(
+            "sgraph_search_elements_by_attributes",
+            sgraph_search_elements_by_attributes.model_id,
+            sgraph_search_elements_by_attributes.model_dump(),
+        )
+        cached = _result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            elements = SearchService.search_elements_by_attributes(
+            elements = await _find_all(
+                "sgraph_search_elements_by_attributes",
+                sgraph_search_elements_by_attributes,
+                SearchService.search_elements_by_attributes,
                 model,
                 sgraph_search_elements_by_attributes.attribute_filters,
                 sgraph_search_elements_by_attributes.scope_path,
             )
-            element_dicts = ElementConverter.elements_to_list(elements)
-            return {
-                "elements": element_dicts,
-                "count": len(element_dicts),
-                "attribute_filters": sgraph_search_elements_by_attributes.attribute_filters,
-            }
+            result = _paged_result(elements, sgraph_search_elements_by_attributes)
+            result["attribute_filters"] = sgraph_search_elements_by_attributes.attribute_filters
+            _result_cache.set(cache_key, result)
+            return result
         except Exception as e:
-            return {"error": f"Search failed: {str(e)}"}
\ No newline at end of file
+            return {"error": f"Search failed: {str(e)}"}
@@ -2,29 +2,72 @@
 Centralized logging configuration for sgraph-mcp-server.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Optional
+from typing import Dict, Optional
+
+# Background thread that writes queued log records; replaced on each setup_logging call
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_listener() -> None:
+    """Flush and stop the background log writer, if one is running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records unformatted, leaving all formatting to the listener thread.
+
+    The stock prepare() formats the message (and any traceback) on the calling
+    thread so records can be pickled; the queue here never leaves the process.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
 def setup_logging(level: str = "INFO", format_string: Optional[str] = None, stream=None) -> None:
-    """Set up centralized logging configuration."""
+    """Set up centralized logging configuration.
+
+    Log calls only enqueue records; a background listener formats and writes
+    them, so slow writes never block tool handlers. Logs go to stderr by
+    default, keeping stdout free for the MCP stdio transport.
+    """
+    global _listener
 
     if format_string is None:
         format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
     if stream is None:
-        stream = sys.stdout
+        stream = sys.stderr
 
     # Convert string level to logging constant
     numeric_level = getattr(logging, level.upper(), logging.INFO)
 
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(logging.Formatter(format_string))
+
+    _stop_listener()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+
     # Configure root logger
-    logging.basicConfig(
-        level=numeric_level,
-        format=format_string,
-        handlers=[logging.StreamHandler(stream)]
-    )
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(_QueueHandler(log_queue))
+    root.setLevel(numeric_level)
     
     # Set specific loggers
     logging.getLogger("sgraph_helper").setLevel(numeric_level)
@@ -34,6 +77,13 @@ def setup_logging(level: str = "INFO", format_string: Optional[str] = None, stre
     logging.getLogger("overview_service").setLevel(numeric_level)
 
 
+# Loggers handed out by get_logger; a plain dict read avoids logging's module lock
+_loggers: Dict[str, logging.Logger] = {}
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with consistent configuration."""
-    return logging.getLogger(name)
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = logging.getLogger(name)
+    return logger
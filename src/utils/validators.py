@@ -2,10 +2,21 @@
 Input validation utilities for sgraph-mcp-server.
 """
 
+import functools
 import os
 import re
+import string
 from typing import Optional
 
+# Bytes allowed in a model ID; deleting them from a valid ID leaves nothing
+_MODEL_ID_CHARS = (string.ascii_letters + string.digits + "_-").encode("ascii")
+
+# Common element types in sgraph models
+_KNOWN_ELEMENT_TYPES = frozenset({
+    "file", "dir", "function", "class", "method", "variable",
+    "repository", "module", "package", "unknown", "other",
+})
+
 
 def validate_model_id(model_id: str) -> bool:
     """Validate that a model ID has the expected format."""
@@ -17,30 +28,51 @@ def validate_model_id(model_id: str) -> bool:
         return False
     
     # Should contain only alphanumeric characters and underscores/hyphens
-    return bool(re.match(r'^[a-zA-Z0-9_-]{24}$', model_id))
+    if not model_id.isascii():
+        return False
+    return not model_id.encode("ascii").translate(None, _MODEL_ID_CHARS)
 
 
-def validate_path(path: str, must_exist: bool = True) -> tuple[bool, Optional[str]]:
+def validate_path(
+    path: str,
+    must_exist: bool = True,
+    root: Optional[str] = None,
+) -> tuple[bool, Optional[str], Optional[os.stat_result]]:
     """
     Validate a file path.
     
+    If ``root`` is given, the path must resolve (following symlinks) to a
+    location inside that directory.
+    
     Returns:
-        tuple: (is_valid, error_message)
+        tuple: (is_valid, error_message, stat_result). stat_result is the
+        path's ``os.stat`` result when ``must_exist`` is set, so callers can
+        reuse it (e.g. the file size) without another syscall.
     """
     if not path:
-        return False, "Path cannot be empty"
+        return False, "Path cannot be empty", None
     
     if not isinstance(path, str):
-        return False, "Path must be a string"
+        return False, "Path must be a string", None
     
-    if must_exist and not os.path.exists(path):
-        return False, f"Path does not exist: {path}"
+    stat_result = None
+    if must_exist:
+        try:
+            stat_result = os.stat(path)
+        except (OSError, ValueError):
+            return False, f"Path does not exist: {path}", None
     
     # Check for potentially dangerous paths
-    if ".." in path:
-        return False, "Path traversal detected"
+    if os.fsencode(path).find(b"..") != -1:
+        return False, "Path traversal detected", None
     
-    return True, None
+    # Symlinks can escape a directory without any ".." in the path
+    if root is not None:
+        real_root = os.path.realpath(root)
+        if os.path.commonpath([real_root, os.path.realpath(path)]) != real_root:
+            return False, f"Path is outside the allowed root: {root}", None
+    
+    return True, None, stat_result
 
 
 def validate_element_type(element_type: str) -> bool:
@@ -48,13 +80,13 @@ def validate_element_type(element_type: str) -> bool:
     if not element_type:
         return False
     
-    # Common element types in sgraph models
-    valid_types = {
-        "file", "dir", "function", "class", "method", "variable", 
-        "repository", "module", "package", "unknown", "other"
-    }
-    
-    return element_type.lower() in valid_types or len(element_type) < 50
+    return element_type.lower() in _KNOWN_ELEMENT_TYPES or len(element_type) < 50
+
+
+@functools.lru_cache(maxsize=512)
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a regex pattern, cached per pattern. Raises re.error if invalid."""
+    return re.compile(pattern)
 
 
 def validate_pattern(pattern: str) -> tuple[bool, Optional[str]]:
@@ -68,7 +100,7 @@ def validate_pattern(pattern: str) -> tuple[bool, Optional[str]]:
         return False, "Pattern cannot be empty"
     
     try:
-        re.compile(pattern)
+        compile_pattern(pattern)
         return True, None
     except re.error as e:
         return False, f"Invalid regex pattern: {str(e)}"
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures.
+
+Models are loaded once per test session and shared between tests.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.model_manager import ModelManager
+
+# Combined sgraph + MCP server model used by the overview performance tests
+LATEST_MODEL_PATH = "/opt/softagram/output/projects/sgraph-and-mcp/latest.xml.zip"
+LANGCHAIN_MODEL_PATH = os.path.join(os.path.dirname(__file__), "sgraph-example-models", "langchain.xml.zip")
+
+
+def _load_shared_model(manager: ModelManager, path: str):
+    """Load a model into the session manager (once per path); skip if it is missing."""
+    if not os.path.exists(path):
+        pytest.skip(f"Model file not found: {path}")
+    model_id = manager.load_model_sync(path)
+    return manager, model_id, manager.get_model(model_id)
+
+
+@pytest.fixture(scope="session")
+def session_model_manager():
+    """ModelManager shared by all tests in the session."""
+    return ModelManager()
+
+
+@pytest.fixture(scope="session")
+def loaded_model(session_model_manager):
+    """(model_manager, model_id, model) for the combined sgraph + MCP server model."""
+    return _load_shared_model(session_model_manager, LATEST_MODEL_PATH)
+
+
+@pytest.fixture(scope="session")
+def langchain_model(session_model_manager):
+    """(model_manager, model_id, model) for the langchain example model."""
+    return _load_shared_model(session_model_manager, LANGCHAIN_MODEL_PATH)
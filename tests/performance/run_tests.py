@@ -10,7 +10,7 @@ from pathlib import Path
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from test_search_performance import test_search_performance
+from test_search_performance import run_search_performance
 from test_all_search_performance import test_all_search_functions_performance
 from test_bulk_analysis_performance import test_bulk_analysis_performance
 from test_model_overview_performance import main as test_model_overview_performance
@@ -22,7 +22,7 @@ async def main():
     print("=" * 50)
     
     tests = [
-        ("Search Elements by Name", test_search_performance),
+        ("Search Elements by Name", run_search_performance),
         ("All Search Functions Comprehensive", test_all_search_functions_performance),
         ("Bulk Analysis Functions", test_bulk_analysis_performance),
         ("Model Overview Performance", test_model_overview_performance),
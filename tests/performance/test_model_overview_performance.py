@@ -9,6 +9,11 @@ import time
 import sys
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median
+from timeit import Timer
+
+import pytest
 
 # Add src to path so we can import the modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -17,108 +22,104 @@ from src.core.model_manager import ModelManager
 from src.services.overview_service import OverviewService
 from src.tools.model_tools import SGraphGetModelOverview
 
-async def test_helper_performance():
-    """Test the direct service function performance"""
+# Combined sgraph + MCP server model (same as the loaded_model fixture in tests/conftest.py)
+MODEL_PATH = "/opt/softagram/output/projects/sgraph-and-mcp/latest.xml.zip"
+
+
+def load_test_model(model_path: str = MODEL_PATH):
+    """Load the test model once; returns (model_manager, model_id, model)."""
+    print(f"📁 Loading model from: {model_path}")
+    model_manager = ModelManager()
+    model_id = model_manager.load_model_sync(model_path)
+    return model_manager, model_id, model_manager.get_model(model_id)
+
+
+async def measure_helper_performance(loaded_model):
+    """Measure the direct service function performance; returns one result per depth"""
     
     print("🔍 Testing OverviewService.get_model_overview performance...")
     
-    # Initialize model manager
-    model_manager = ModelManager()
-    
-    # Test with the combined model
-    model_path = "/opt/softagram/output/projects/sgraph-and-mcp/latest.xml.zip"
+    model_manager, model_id, model = loaded_model
     
-    try:
-        print(f"📁 Loading model from: {model_path}")
-        model_id = await model_manager.load_model(model_path)
-        model = model_manager.get_model(model_id)
-        
-        if model is None:
-            print("❌ Failed to retrieve model")
-            return False
-        
-        print(f"✅ Model loaded successfully (ID: {model_id})")
-        
-        # Performance requirements from AI agent perspective
-        test_cases = [
-            {"depth": 1, "target_ms": 25, "description": "Quick root overview"},
-            {"depth": 2, "target_ms": 50, "description": "Directory structure"},
-            {"depth": 3, "target_ms": 75, "description": "File-level overview"},
-            {"depth": 4, "target_ms": 100, "description": "Detailed structure"},
-            {"depth": 5, "target_ms": 150, "description": "Deep analysis"},
-        ]
-        
-        all_passed = True
-        results = []
-        
-        for test_case in test_cases:
-            depth = test_case["depth"]
-            target_ms = test_case["target_ms"]
-            description = test_case["description"]
-            
-            print(f"\n📊 Testing depth {depth} - {description} (target: <{target_ms}ms)")
-            
-            # Warm up call
-            OverviewService.get_model_overview(model, max_depth=depth, include_counts=True)
-            
-            # Multiple runs for accurate measurement
-            times = []
-            for i in range(5):
-                start_time = time.perf_counter()
-                result = OverviewService.get_model_overview(model, max_depth=depth, include_counts=True)
-                end_time = time.perf_counter()
-                times.append((end_time - start_time) * 1000)
-            
-            avg_ms = sum(times) / len(times)
-            min_ms = min(times)
-            max_ms = max(times)
-            
-            # Validate results
-            total_elements = result['summary']['total_elements']
-            depth_counts = result['summary']['depth_counts']
-            type_counts = result['summary']['type_distribution']
-            
-            print(f"  ⏱️  Avg: {avg_ms:.1f}ms, Min: {min_ms:.1f}ms, Max: {max_ms:.1f}ms")
-            print(f"  📈 Total elements: {total_elements}")
-            print(f"  📊 Depths found: {list(depth_counts.keys())}")
-            print(f"  🏷️  Types: {len(type_counts)} different types")
-            
-            # Check performance
-            if avg_ms <= target_ms:
-                print(f"  ✅ PASSED (avg {avg_ms:.1f}ms ≤ {target_ms}ms target)")
-                status = "PASS"
-            else:
-                print(f"  ❌ FAILED (avg {avg_ms:.1f}ms > {target_ms}ms target)")
-                all_passed = False
-                status = "FAIL"
-            
-            results.append({
-                "depth": depth,
-                "description": description,
-                "avg_ms": avg_ms,
-                "target_ms": target_ms,
-                "status": status,
-                "elements": total_elements
-            })
-        
-        return all_passed, results
-        
-    except Exception as e:
-        print(f"❌ Error during helper performance test: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return False, []
+    assert model is not None, "Failed to retrieve model"
+
+    print(f"✅ Model loaded successfully (ID: {model_id})")
+
+    # Performance requirements from AI agent perspective
+    test_cases = [
+        {"depth": 1, "target_ms": 25, "description": "Quick root overview"},
+        {"depth": 2, "target_ms": 50, "description": "Directory structure"},
+        {"depth": 3, "target_ms": 75, "description": "File-level overview"},
+        {"depth": 4, "target_ms": 100, "description": "Detailed structure"},
+        {"depth": 5, "target_ms": 150, "description": "Deep analysis"},
+    ]
+
+    results = []
+
+    for test_case in test_cases:
+        depth = test_case["depth"]
+        target_ms = test_case["target_ms"]
+        description = test_case["description"]
+
+        print(f"\n📊 Testing depth {depth} - {description} (target: <{target_ms}ms)")
+
+        # Multiple runs for accurate measurement (timeit disables GC while timing).
+        # The first run is the cold call; the rest measure the warm steady state.
+        timer = Timer(lambda: OverviewService.get_model_overview(model, max_depth=depth, include_counts=True))
+        samples = [seconds * 1000 for seconds in timer.repeat(repeat=6, number=1)]
+        cold_ms, times = samples[0], samples[1:]
+        result = OverviewService.get_model_overview(model, max_depth=depth, include_counts=True)
+
+        # The median is robust against outlier runs
+        avg_ms = median(times)
+        min_ms = min(times)
+        max_ms = max(times)
+
+        # Validate results
+        total_elements = result['summary']['total_elements']
+        depth_counts = result['summary']['depth_counts']
+        type_counts = result['summary']['type_distribution']
 
-async def test_service_performance():
+        print(f"  ⏱️  Cold: {cold_ms:.1f}ms, Median: {avg_ms:.1f}ms, Min: {min_ms:.1f}ms, Max: {max_ms:.1f}ms")
+        print(f"  📈 Total elements: {total_elements}")
+        print(f"  📊 Depths found: {list(depth_counts.keys())}")
+        print(f"  🏷️  Types: {len(type_counts)} different types")
+
+        # Check performance
+        if avg_ms <= target_ms:
+            print(f"  ✅ PASSED (median {avg_ms:.1f}ms ≤ {target_ms}ms target)")
+            status = "PASS"
+        else:
+            print(f"  ❌ FAILED (median {avg_ms:.1f}ms > {target_ms}ms target)")
+            status = "FAIL"
+
+        results.append({
+            "depth": depth,
+            "description": description,
+            "avg_ms": avg_ms,
+            "target_ms": target_ms,
+            "status": status,
+            "elements": total_elements
+        })
+
+    return results
+
+
+@pytest.mark.asyncio
+async def test_helper_performance(loaded_model):
+    """Test the direct service function performance"""
+    results = await measure_helper_performance(loaded_model)
+    failed = [result["depth"] for result in results if result["status"] != "PASS"]
+    assert not failed, f"Overview exceeded its time target at depths {failed}"
+
+
+@pytest.mark.asyncio
+async def test_service_performance(loaded_model):
     """Test the service call performance"""
     
     print("\n🔧 Testing service call performance...")
     
-    # Initialize model manager and load model
-    model_manager = ModelManager()
-    model_path = "/opt/softagram/output/projects/sgraph-and-mcp/latest.xml.zip"
-    model_id = await model_manager.load_model(model_path)
-    model = model_manager.get_model(model_id)
+    model_manager, model_id, model = loaded_model
     
     # Test MCP tool performance
     test_cases = [
@@ -135,67 +136,62 @@ async def test_service_performance():
         
         print(f"\n🛠️  Testing service depth {depth} (target: <{target_ms}ms)")
         
-        # Warm up
-        OverviewService.get_model_overview(model, max_depth=depth, include_counts=True)
-        
-        # Multiple runs
-        times = []
-        for i in range(5):
-            start_time = time.perf_counter()
-            result = OverviewService.get_model_overview(model, max_depth=depth, include_counts=True)
-            end_time = time.perf_counter()
-            times.append((end_time - start_time) * 1000)
+        # Multiple runs (timeit disables GC while timing); the first, cold run is
+        # reported separately from the warm steady state
+        timer = Timer(lambda: OverviewService.get_model_overview(model, max_depth=depth, include_counts=True))
+        samples = timer.repeat(repeat=6, number=1)
+        cold_ms, times = samples[0] * 1000, samples[1:]
+        result = OverviewService.get_model_overview(model, max_depth=depth, include_counts=True)
         
-        avg_ms = sum(times) / len(times)
+        # The median is robust against outlier runs
+        avg_ms = median(times) * 1000
         
         # Validate response structure
-        if not result or 'summary' not in result:
-            print(f"  ❌ Service returned invalid result")
-            all_passed = False
-            continue
+        assert result and 'summary' in result, f"Service returned invalid result at depth {depth}"
         
         elements_count = result['summary']['total_elements']
         
-        print(f"  ⏱️  Avg service call: {avg_ms:.1f}ms")
+        print(f"  ⏱️  Cold service call: {cold_ms:.1f}ms, median warm call: {avg_ms:.1f}ms")
         print(f"  📊 Elements returned: {elements_count}")
         
         if avg_ms <= target_ms:
-            print(f"  ✅ PASSED (avg {avg_ms:.1f}ms ≤ {target_ms}ms target)")
+            print(f"  ✅ PASSED (median {avg_ms:.1f}ms ≤ {target_ms}ms target)")
         else:
-            print(f"  ❌ FAILED (avg {avg_ms:.1f}ms > {target_ms}ms target)")
+            print(f"  ❌ FAILED (median {avg_ms:.1f}ms > {target_ms}ms target)")
             all_passed = False
     
-    return all_passed
+    assert all_passed, "Service calls exceeded their time target"
 
-async def test_scalability():
+@pytest.mark.asyncio
+async def test_scalability(loaded_model):
     """Test tool performance with different model sizes"""
     
     print("\n📏 Testing scalability characteristics...")
     
-    model_manager = ModelManager()
-    model_path = "/opt/softagram/output/projects/sgraph-and-mcp/latest.xml.zip"
-    model_id = await model_manager.load_model(model_path)
-    model = model_manager.get_model(model_id)
+    model_manager, model_id, model = loaded_model
     
     # Test scaling with depth
     print("  🔍 Analyzing performance scaling with depth...")
     
-    scaling_results = []
-    for depth in range(1, 8):
+    def measure(depth):
         start_time = time.perf_counter()
         result = OverviewService.get_model_overview(model, max_depth=depth, include_counts=False)
         end_time = time.perf_counter()
-        
-        duration_ms = (end_time - start_time) * 1000
-        elements = result['summary']['total_elements']
-        
-        scaling_results.append({
+        return {
             "depth": depth,
-            "duration_ms": duration_ms,
-            "elements": elements
-        })
-        
-        print(f"    Depth {depth}: {duration_ms:.1f}ms, {elements} elements")
+            "duration_ms": (end_time - start_time) * 1000,
+            "elements": result['summary']['total_elements'],
+        }
+    
+    # The depths are independent; run them concurrently and time each call
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        scaling_results = await asyncio.gather(
+            *[loop.run_in_executor(pool, measure, depth) for depth in range(1, 8)]
+        )
+    
+    for scaling_result in scaling_results:
+        print(f"    Depth {scaling_result['depth']}: {scaling_result['duration_ms']:.1f}ms, {scaling_result['elements']} elements")
     
     # Check if performance scales reasonably (should be roughly linear or better)
     print("\n  📈 Scalability analysis:")
@@ -209,23 +205,39 @@ async def test_scalability():
         efficiency = element_ratio / time_ratio if time_ratio > 0 else 0
         
         print(f"    Depth {prev['depth']}→{curr['depth']}: {efficiency:.1f}x efficiency (elements/time ratio)")
-    
+
+async def passes(test) -> bool:
+    """Await a test coroutine outside pytest; False if one of its assertions fails."""
+    try:
+        await test
+    except AssertionError as e:
+        print(f"❌ {e}")
+        return False
     return True
 
+
 async def main():
     """Run all performance tests"""
     
     print("🚀 SGRAPH MODEL OVERVIEW PERFORMANCE TESTS")
     print("=" * 50)
     
+    # Load the model once and share it between the tests
+    try:
+        loaded_model = load_test_model()
+    except Exception as e:
+        print(f"❌ Failed to load model: {str(e)}")
+        return False
+    
     # Test helper performance
-    helper_passed, helper_results = await test_helper_performance()
+    helper_results = await measure_helper_performance(loaded_model)
+    helper_passed = all(result["status"] == "PASS" for result in helper_results)
     
     # Test service performance
-    service_passed = await test_service_performance()
+    service_passed = await passes(test_service_performance(loaded_model))
     
     # Test scalability
-    scale_passed = await test_scalability()
+    scale_passed = await passes(test_scalability(loaded_model))
     
     # Summary
     print("\n" + "=" * 50)
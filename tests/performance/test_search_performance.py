@@ -11,44 +11,51 @@ import sys
 import time
 from pathlib import Path
 
+import pytest
+
 # Add src directory to path to import our modules
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from sgraph_helper import SGraphHelper
+from src.core.model_index import get_model_index
 
 
-async def test_search_performance():
-    """Test the performance of sgraph_search_elements_by_name."""
-    print("=== SGraph Search Performance Test ===")
-    
-    # Initialize helper
+# Path to the test model (same as the langchain_model fixture in tests/conftest.py)
+MODEL_PATH = Path(__file__).parent.parent / "sgraph-example-models" / "langchain.xml.zip"
+
+
+async def load_test_model():
+    """Load the test model once; returns (helper, model_id, model) or None."""
     helper = SGraphHelper()
     
-    # Path to the test model
-    model_path = Path(__file__).parent.parent / "sgraph-example-models" / "langchain.xml.zip"
+    if not MODEL_PATH.exists():
+        print(f"❌ Test model not found at: {MODEL_PATH}")
+        return None
     
-    if not model_path.exists():
-        print(f"❌ Test model not found at: {model_path}")
-        return False
-    
-    print(f"📁 Loading model from: {model_path}")
+    print(f"📁 Loading model from: {MODEL_PATH}")
     
     # Load the model and measure loading time
     load_start = time.perf_counter()
     try:
-        model_id = await helper.load_sgraph(str(model_path))
+        model_id = await helper.load_sgraph(str(MODEL_PATH))
         load_end = time.perf_counter()
         load_duration = (load_end - load_start) * 1000  # Convert to milliseconds
         print(f"⏱️  Model loaded in: {load_duration:.2f} ms")
     except Exception as e:
         print(f"❌ Failed to load model: {e}")
-        return False
+        return None
     
-    # Get the model for direct access
-    model = helper.get_model(model_id)
-    if model is None:
-        print("❌ Failed to retrieve loaded model")
-        return False
+    return helper, model_id, helper.get_model(model_id)
+
+
+@pytest.mark.asyncio
+async def test_search_performance(langchain_model):
+    """Test the performance of sgraph_search_elements_by_name."""
+    print("=== SGraph Search Performance Test ===")
+    
+    helper = SGraphHelper()
+    _, model_id, model = langchain_model
+    assert model is not None, "Failed to retrieve loaded model"
     
     print(f"📊 Model loaded successfully with ID: {model_id}")
     
@@ -63,60 +70,62 @@ async def test_search_performance():
     
     # Perform the search and measure time
     search_start = time.perf_counter()
+    results = helper.search_elements_by_name(
+        model=model,
+        pattern=search_pattern,
+        element_type=expected_type
+    )
+    search_end = time.perf_counter()
+    search_duration = (search_end - search_start) * 1000  # Convert to milliseconds
+
+    print(f"⏱️  Search completed in: {search_duration:.2f} ms")
+    print(f"📈 Found {len(results)} matching elements")
+
+    # Verify results; paths come from the model index (built by the search),
+    # which memoizes them instead of walking the parent chain per call
+    index = get_model_index(model)
+    found_target = False
+    for element in results:
+        element_path = index.path_of(element)
+        element_type = element.getType()
+        element_name = element.name
+
+        print(f"   - {element_name} ({element_type}): {element_path}")
+
+        if element_path == expected_path and element_type == expected_type:
+            found_target = True
+            print(f"   ✅ Found target element!")
+
+    # Performance assertion
+    max_duration_ms = 100
+    assert search_duration <= max_duration_ms, (
+        f"PERFORMANCE FAILURE: Search took {search_duration:.2f} ms, expected < {max_duration_ms} ms"
+    )
+    print(f"✅ PERFORMANCE PASS: Search completed within {max_duration_ms} ms limit")
+
+    # Correctness assertion
+    assert found_target, "CORRECTNESS FAILURE: Target element not found"
+    print(f"✅ CORRECTNESS PASS: Target element found correctly")
+
+
+async def run_search_performance():
+    """Load the model and run the search performance test outside pytest."""
+    loaded_model = await load_test_model()
+    if loaded_model is None:
+        return False
     try:
-        results = helper.search_elements_by_name(
-            model=model,
-            pattern=search_pattern,
-            element_type=expected_type
-        )
-        search_end = time.perf_counter()
-        search_duration = (search_end - search_start) * 1000  # Convert to milliseconds
-        
-        print(f"⏱️  Search completed in: {search_duration:.2f} ms")
-        print(f"📈 Found {len(results)} matching elements")
-        
-        # Verify results
-        found_target = False
-        for element in results:
-            element_path = element.getPath()
-            element_type = element.getType()
-            element_name = element.name
-            
-            print(f"   - {element_name} ({element_type}): {element_path}")
-            
-            if element_path == expected_path and element_type == expected_type:
-                found_target = True
-                print(f"   ✅ Found target element!")
-        
-        # Performance assertion
-        max_duration_ms = 100
-        if search_duration > max_duration_ms:
-            print(f"❌ PERFORMANCE FAILURE: Search took {search_duration:.2f} ms, expected < {max_duration_ms} ms")
-            return False
-        else:
-            print(f"✅ PERFORMANCE PASS: Search completed within {max_duration_ms} ms limit")
-        
-        # Correctness assertion
-        if not found_target:
-            print(f"❌ CORRECTNESS FAILURE: Target element not found")
-            return False
-        else:
-            print(f"✅ CORRECTNESS PASS: Target element found correctly")
-        
-        return True
-        
-    except Exception as e:
-        search_end = time.perf_counter()
-        search_duration = (search_end - search_start) * 1000
-        print(f"❌ Search failed after {search_duration:.2f} ms: {e}")
+        await test_search_performance(loaded_model)
+    except AssertionError as e:
+        print(f"❌ {e}")
         return False
+    return True
 
 
 async def main():
     """Main test runner."""
     print("Starting performance test...")
     
-    success = await test_search_performance()
+    success = await run_search_performance()
     
     if success:
         print("\n🎉 All tests PASSED!")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the logging setup.
+"""
+
+import io
+import logging
+import os
+import sys
+import threading
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils import logging as sgraph_logging
+
+
+class TestSetupLogging:
+    """Test cases for setup_logging."""
+
+    def setup_method(self):
+        root = logging.getLogger()
+        self.handlers, self.level = root.handlers[:], root.level
+
+    def teardown_method(self):
+        sgraph_logging._stop_listener()
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in self.handlers:
+            root.addHandler(handler)
+        root.setLevel(self.level)
+
+    def test_messages_are_formatted_on_listener_thread(self):
+        formatted_on = []
+
+        class Arg:
+            def __str__(self):
+                formatted_on.append(threading.current_thread())
+                return 'arg'
+
+        stream = io.StringIO()
+        sgraph_logging.setup_logging(stream=stream, format_string='%(message)s')
+        logging.getLogger('test_logging').info('value: %s', Arg())
+        sgraph_logging._stop_listener()
+
+        assert stream.getvalue() == 'value: arg\n'
+        assert formatted_on and threading.current_thread() not in formatted_on
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the flattened ModelIndex.
+"""
+
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from sgraph import SElement, SGraph
+from src.core import model_index
+from src.core.model_index import HYPERSCAN_AVAILABLE, ModelIndex, get_model_index
+
+
+def _build_model():
+    """Build a small model:
+
+    /Project
+      /Project/src
+        /Project/src/service.py
+          /Project/src/service.py/UserService
+        /Project/src/util.py
+      /Project/tests
+        /Project/tests/test_service.py
+    """
+    root = SElement(None, '')
+    project = SElement(root, 'Project')
+    src = SElement(project, 'src')
+    service_py = SElement(src, 'service.py')
+    SElement(service_py, 'UserService').setType('class')
+    SElement(src, 'util.py')
+    tests = SElement(project, 'tests')
+    SElement(tests, 'test_service.py')
+    return SGraph(root)
+
+
+def _traversal_order(element):
+    """Stack-based traversal used throughout the search code."""
+    order = []
+    stack = [element]
+    while stack:
+        e = stack.pop()
+        order.append(e)
+        stack.extend(e.children)
+    return order
+
+
+class TestModelIndex:
+    """Test cases for ModelIndex."""
+
+    def setup_method(self):
+        self.model = _build_model()
+        self.index = ModelIndex(self.model.rootNode)
+
+    def test_elements_follow_traversal_order(self):
+        assert self.index.elements == _traversal_order(self.model.rootNode)
+        assert len(self.index) == 8
+
+    def test_scope_range_covers_subtree(self):
+        src = self.model.findElementFromPath('/Project/src')
+        start, end = self.index.scope_range(src)
+        assert self.index.elements[start:end] == _traversal_order(src)
+
+    def test_subtree_with_max_depth(self):
+        project = self.model.findElementFromPath('/Project')
+        assert self.index.subtree(project) == _traversal_order(project)
+        shallow = self.index.subtree(project, max_depth=1)
+        assert sorted(e.name for e in shallow) == ['Project', 'src', 'tests']
+        assert self.index.subtree(SElement(None, 'detached')) is None
+
+    def test_scope_range_unknown_element(self):
+        assert self.index.scope_range(SElement(None, 'detached')) is None
+
+    def test_get_model_index_is_cached(self):
+        assert get_model_index(self.model) is get_model_index(self.model)
+
+    def test_get_model_index_without_build(self):
+        model = _build_model()
+        assert get_model_index(model, build=False) is None
+        index = get_model_index(model)
+        assert get_model_index(model, build=False) is index
+
+    def test_types_column(self):
+        assert self.index.types == [e.getType() for e in self.index.elements]
+        src = self.model.findElementFromPath('/Project/src')
+        matches = self.index.find_types('class', *self.index.scope_range(src))
+        assert [self.index.elements[i].name for i in matches] == ['UserService']
+
+    def test_path_of(self):
+        for element in self.index.elements:
+            assert self.index.path_of(element) == element.getPath()
+        detached = SElement(None, 'detached')
+        assert self.index.path_of(detached) == detached.getPath()
+
+    def test_find_names_containing(self):
+        src = self.model.findElementFromPath('/Project/src')
+        start, end = self.index.scope_range(src)
+        for text in ['service', 'Service', '.py', '']:
+            expected = [i for i in range(start, end) if text in self.index.names[i]]
+            assert self.index.find_names_containing(text, start, end) == expected
+
+    def test_find_names_and_matching(self):
+        src = self.model.findElementFromPath('/Project/src')
+        start, end = self.index.scope_range(src)
+        names = self.index.names
+        for name in set(names):
+            expected = [i for i in range(start, end) if names[i] == name]
+            assert self.index.find_names([name, name + '-missing'], start, end) == expected
+        for pattern in ['service', r'.*\.py$', '^User', '(?i)SERVICE']:
+            regex = re.compile(pattern)
+            expected = [i for i in range(start, end) if regex.search(names[i])]
+            assert self.index.find_names_matching(regex, start, end) == expected
+
+    def test_count_depths_and_types(self):
+        for max_depth in range(5):
+            depth_counts, type_counts = self.index.count_depths_and_types(max_depth)
+            kept = [i for i in range(len(self.index)) if self.index.depths[i] <= max_depth]
+            assert depth_counts == dict(sorted(
+                (d, sum(1 for i in kept if self.index.depths[i] == d))
+                for d in {self.index.depths[i] for i in kept}
+            ))
+            assert type_counts == {
+                t: sum(1 for i in kept if self.index.types[i] == t)
+                for t in {self.index.types[i] for i in kept}
+            }
+
+    def test_count_depths_and_types_without_numpy(self, monkeypatch):
+        monkeypatch.setattr(model_index, 'numpy', None)
+        plain_index = ModelIndex(self.model.rootNode)
+        for max_depth in range(-1, 6):
+            assert plain_index.count_depths_and_types(max_depth) == self.index.count_depths_and_types(max_depth)
+
+    @pytest.mark.skipif(not HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+    def test_search_names_matches_re(self):
+        src = self.model.findElementFromPath('/Project/src')
+        start, end = self.index.scope_range(src)
+        for pattern in ['service', r'.*\.py$', '^User', '(?i)SERVICE']:
+            regex = re.compile(pattern)
+            matches = self.index.search_names(regex, start, end)
+            expected = [
+                i for i in range(start, end) if regex.search(self.index.names[i])
+            ]
+            assert matches == expected
+
+    @pytest.mark.skipif(not HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+    def test_search_names_sharded(self, monkeypatch):
+        regex = re.compile('service')
+        expected = self.index.search_names(regex, 0, len(self.index))
+        monkeypatch.setattr(model_index, 'SCAN_WORKERS', 3)
+        monkeypatch.setattr(model_index, 'PARALLEL_SCAN_BYTES', 0)
+        assert self.index.search_names(regex, 0, len(self.index)) == expected
+
+    @pytest.mark.skipif(not HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+    def test_search_names_concurrent(self):
+        # Searches run on worker threads and share the compiled pattern
+        root = SElement(None, '')
+        for i in range(50000):
+            SElement(root, f'name{i}service')
+        index = ModelIndex(root)
+        regex = re.compile('service')
+        barrier = threading.Barrier(8)
+
+        def search(_):
+            barrier.wait()
+            return [index.search_names(regex, 0, len(index)) for _ in range(3)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = [matches for batch in executor.map(search, range(8)) for matches in batch]
+        assert results == [list(range(1, len(index)))] * len(results)
+
+    @pytest.mark.skipif(not HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+    @pytest.mark.filterwarnings("ignore:Possible nested set:FutureWarning")
+    @pytest.mark.parametrize('pattern', [
+        r'\AUser', r'\.py\Z', r'Serv{,2}ice', r'Servi?+ce', r'(?>Serv)ice', r'[[:alpha:]]',
+    ])
+    def test_search_names_pcre_differences(self, pattern):
+        # Read differently by Hyperscan (PCRE) and re; left to the caller
+        assert self.index.search_names(re.compile(pattern), 0, len(self.index)) is None
+
+    @pytest.mark.skipif(not HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+    def test_search_names_verbose_flag(self):
+        regex = re.compile('User Service', re.VERBOSE)
+        assert self.index.search_names(regex, 0, len(self.index)) is None
+
+    @pytest.mark.skipif(not HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+    def test_search_names_unsupported_pattern(self):
+        # Backreferences are not supported by Hyperscan
+        regex = re.compile(r'(s)\1')
+        assert self.index.search_names(regex, 0, len(self.index)) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
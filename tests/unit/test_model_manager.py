@@ -11,7 +11,11 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
+from src.core.model_index import get_model_index
 from src.core.model_manager import ModelManager
+from src.services import overview_service
+from src.services.overview_service import OverviewService
+from src.tools import model_tools
 
 
 class TestModelManager:
@@ -19,6 +23,7 @@ class TestModelManager:
     
     def setup_method(self):
         """Set up test fixtures."""
+        ModelManager.clear_shared_models()
         self.manager = ModelManager()
     
     def test_initialization(self):
@@ -45,6 +50,112 @@ class TestModelManager:
         """Test removing a model that doesn't exist."""
         result = self.manager.remove_model("nonexistent_id")
         assert result is False
+
+    def test_removal_listeners(self):
+        """Test that removal listeners are told about removed and cleared models."""
+        removed = []
+        self.manager.on_model_removed(removed.append)
+        self.manager.on_model_removed(removed.append)  # registered once
+        self.manager._models["a"] = object()
+        self.manager._models["b"] = object()
+        self.manager._models["c"] = object()
+
+        self.manager.remove_model("a")
+        self.manager.remove_model("nonexistent_id")
+        assert removed == ["a"]
+
+        self.manager.clear_cache()
+        assert sorted(removed) == ["a", "b", "c"]
+
+    def test_listeners_see_removed_model(self):
+        """Test that listeners can still look up the model being removed."""
+        model = object()
+        seen = []
+        self.manager.on_model_removed(lambda model_id: seen.append(self.manager.get_model(model_id)))
+        self.manager._models["a"] = model
+        self.manager.remove_model("a")
+        assert seen == [model]
+        assert self.manager.get_model("a") is None
+
+    @pytest.mark.asyncio
+    async def test_remove_model_drops_derived_caches(self):
+        """Test that removing a model drops its index and (via a listener) its overviews."""
+        model_path = os.path.join(os.path.dirname(__file__), '..', 'sgraph-and-mcp.xml.zip')
+        model_id = await self.manager.load_model(model_path)
+        model = self.manager.get_model(model_id)
+        self.manager.on_model_removed(
+            lambda removed_id: OverviewService.forget_model(self.manager.get_model(removed_id))
+        )
+        overview = OverviewService.get_model_overview(model, max_depth=2)
+        assert get_model_index(model, build=False) is not None
+
+        self.manager.remove_model(model_id)
+        assert get_model_index(model, build=False) is None
+        # The next request builds the overview again instead of hitting the memo
+        rebuilt = OverviewService.get_model_overview(model, max_depth=2)
+        assert rebuilt is not overview
+        assert rebuilt == overview
+    
+    @pytest.mark.asyncio
+    async def test_model_tools_listener_forgets_overviews(self):
+        """Test that the model tools' removal listener drops the removed model's overviews."""
+        manager = model_tools.model_manager
+        manager.on_model_removed(model_tools._forget_overviews)
+        model_path = os.path.join(os.path.dirname(__file__), '..', 'sgraph-and-mcp.xml.zip')
+        model_id = await manager.load_model(model_path)
+        model = manager.get_model(model_id)
+        try:
+            OverviewService.get_model_overview(model, max_depth=2)
+            assert model in overview_service._overview_cache
+        finally:
+            manager.remove_model(model_id)
+        assert model not in overview_service._overview_cache
+
+    @pytest.mark.asyncio
+    async def test_remove_model_keeps_caches_of_shared_model(self):
+        """Test that a model another manager still holds keeps its index."""
+        model_path = os.path.join(os.path.dirname(__file__), '..', 'sgraph-and-mcp.xml.zip')
+        model_id = await self.manager.load_model(model_path)
+        model = self.manager.get_model(model_id)
+        other = ModelManager()
+        other_id = await other.load_model(model_path)
+        assert other.get_model(other_id) is model
+        assert self.manager.is_held_elsewhere(model)
+
+        self.manager.remove_model(model_id)
+        assert not other.is_held_elsewhere(model)
+        assert get_model_index(model, build=False) is not None
+
+        other.remove_model(other_id)
+        assert get_model_index(model, build=False) is None
+
+    @pytest.mark.asyncio
+    async def test_reload_unchanged_file_reuses_model(self):
+        """Test that loading the same unchanged file again returns the cached model."""
+        model_path = os.path.join(os.path.dirname(__file__), '..', 'sgraph-and-mcp.xml.zip')
+        model_id = await self.manager.load_model(model_path)
+        assert await self.manager.load_model(model_path) == model_id
+        assert self.manager.load_model_sync(model_path) == model_id
+
+        self.manager.remove_model(model_id)
+        reloaded_id = await self.manager.load_model(model_path)
+        assert reloaded_id != model_id
+        assert self.manager.get_model(reloaded_id) is not None
+    
+    @pytest.mark.asyncio
+    async def test_managers_share_loaded_models(self):
+        """Test that another manager loading the same file gets the same model object."""
+        model_path = os.path.join(os.path.dirname(__file__), '..', 'sgraph-and-mcp.xml.zip')
+        model = self.manager.get_model(await self.manager.load_model(model_path))
+
+        other = ModelManager()
+        other_id = await other.load_model(model_path)
+        assert other.get_model(other_id) is model
+        assert other.list_models().keys() == {other_id}
+
+        ModelManager.clear_shared_models()
+        third = ModelManager()
+        assert third.get_model(third.load_model_sync(model_path)) is not model
     
     @pytest.mark.asyncio
     async def test_load_nonexistent_file(self):
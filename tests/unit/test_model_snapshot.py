@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Unit tests for model snapshots.
+"""
+
+import os
+import pickle
+import shutil
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from sgraph import SElement, SElementAssociation, SGraph
+from src.core.model_manager import ModelManager
+from src.core.model_snapshot import load_snapshot, save_snapshot, snapshot_path
+
+MODEL_PATH = os.path.realpath(os.path.join(os.path.dirname(__file__), '..', 'sgraph-and-mcp.xml.zip'))
+
+
+def _model():
+    root = SElement(None, '')
+    project = SElement(root, 'Project')
+    service = SElement(project, 'service.py')
+    service.setType('file')
+    util = SElement(project, 'util.py')
+    util.attrs['loc'] = 10
+    SElement(project, 'README.md')
+    association = SElementAssociation(service, util, 'import', {'line': 3})
+    association.initElems()
+    model = SGraph(root)
+    model.modelAttrs['version'] = '1'
+    return model
+
+
+class TestModelSnapshot:
+    """Test cases for model snapshots."""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / 'model.pkl')
+        save_snapshot(_model(), path)
+        model = load_snapshot(path)
+
+        project = model.findElementFromPath('/Project')
+        assert [child.name for child in project.children] == ['service.py', 'util.py', 'README.md']
+        service = model.findElementFromPath('/Project/service.py')
+        util = model.findElementFromPath('/Project/util.py')
+        assert service.getType() == 'file'
+        assert util.attrs == {'loc': 10}
+        assert service.outgoing[0].toElement is util
+        assert util.incoming == service.outgoing
+        assert util.incoming[0].attrs == {'line': 3}
+        assert model.modelAttrs == {'version': '1'}
+
+    def test_missing_or_foreign_snapshot(self, tmp_path):
+        assert load_snapshot(str(tmp_path / 'missing.pkl')) is None
+        # Snapshots never contain classes, so pickled objects are rejected
+        foreign = tmp_path / 'foreign.pkl'
+        foreign.write_bytes(pickle.dumps(os.stat_result((0,) * 10)))
+        assert load_snapshot(str(foreign)) is None
+
+    def test_manager_reuses_snapshot(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ModelManager, 'snapshot_dir', str(tmp_path))
+        ModelManager.clear_shared_models()
+        model_path = MODEL_PATH
+        parsed = ModelManager()
+        parsed_model = parsed.get_model(parsed.load_model_sync(model_path))
+        assert os.path.exists(snapshot_path(str(tmp_path), model_path, os.stat(model_path)))
+
+        # Without the in-process shared copy, the model comes from the snapshot
+        ModelManager.clear_shared_models()
+        restored = ModelManager()
+        restored_model = restored.get_model(restored.load_model_sync(model_path))
+        assert restored_model is not parsed_model
+        assert [c.name for c in restored_model.rootNode.children] == [c.name for c in parsed_model.rootNode.children]
+
+    def test_only_newest_snapshot_is_kept(self, tmp_path, monkeypatch):
+        snapshot_dir = tmp_path / 'snapshots'
+        monkeypatch.setattr(ModelManager, 'snapshot_dir', str(snapshot_dir))
+        model_path = str(tmp_path / 'model.xml.zip')
+        other_path = str(tmp_path / 'other.xml.zip')
+        shutil.copyfile(MODEL_PATH, model_path)
+        shutil.copyfile(MODEL_PATH, other_path)
+
+        ModelManager.clear_shared_models()
+        ModelManager().load_model_sync(other_path)
+        ModelManager().load_model_sync(model_path)
+        # A new version of the file replaces the snapshot of the old one
+        os.utime(model_path, ns=(0, os.stat(model_path).st_mtime_ns + 10**9))
+        ModelManager().load_model_sync(model_path)
+
+        assert sorted(os.listdir(snapshot_dir)) == sorted(
+            os.path.basename(snapshot_path(str(snapshot_dir), path, os.stat(path)))
+            for path in (model_path, other_path)
+        )
+
+    def test_snapshots_are_off_by_default(self):
+        assert ModelManager.snapshot_dir is None
+
+    def test_symlinked_modelfile_is_not_snapshotted(self, tmp_path, monkeypatch):
+        snapshot_dir = tmp_path / 'snapshots'
+        monkeypatch.setattr(ModelManager, 'snapshot_dir', str(snapshot_dir))
+        model_dir = tmp_path / 'project' / 'dependency'
+        model_dir.mkdir(parents=True)
+        link_path = model_dir / 'modelfile.xml.zip'
+        link_path.symlink_to(MODEL_PATH)
+
+        ModelManager.clear_shared_models()
+        manager = ModelManager()
+        model_id = manager.load_model_sync(str(link_path))
+        # Loaded with its attribute files, so it is not the same model as the target
+        assert manager.load_model_sync(MODEL_PATH) != model_id
+        assert os.listdir(snapshot_dir) == [
+            os.path.basename(snapshot_path(str(snapshot_dir), MODEL_PATH, os.stat(MODEL_PATH)))
+        ]
+
+    def test_symlinked_model_shares_snapshot(self, tmp_path, monkeypatch):
+        snapshot_dir = tmp_path / 'snapshots'
+        monkeypatch.setattr(ModelManager, 'snapshot_dir', str(snapshot_dir))
+        link_path = tmp_path / 'linked.xml.zip'
+        link_path.symlink_to(MODEL_PATH)
+
+        ModelManager.clear_shared_models()
+        manager = ModelManager()
+        model_id = manager.load_model_sync(str(link_path))
+        assert manager.load_model_sync(MODEL_PATH) == model_id
+        assert len(os.listdir(snapshot_dir)) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
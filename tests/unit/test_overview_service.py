@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for OverviewService.
+"""
+
+import copy
+import os
+import sys
+
+import pydantic_core
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from sgraph import SElement, SGraph
+from src.services import overview_service
+from src.services.overview_service import OverviewService
+from src.tools import model_tools
+
+
+def _model():
+    root = SElement(None, '')
+    project = SElement(root, 'Project')
+    src = SElement(project, 'src')
+    SElement(src, 'main.py').setType('file')
+    SElement(project, 'README.md').setType('file')
+    return SGraph(root)
+
+
+class TestOverviewService:
+    """Test cases for OverviewService."""
+
+    def test_summary(self):
+        overview = OverviewService.get_model_overview(_model(), max_depth=2)
+        assert overview['summary']['total_elements'] == 4
+        assert overview['summary']['depth_counts'] == {0: 1, 1: 1, 2: 2}
+        assert overview['summary']['type_distribution'] == {'unknown': 3, 'file': 1}
+        src = overview['tree_structure']['children']['Project']['children']['src']
+        assert src['has_more_children'] == 1
+
+    def test_type_distribution_order(self):
+        # Types in order of first appearance in a preorder walk of the counted
+        # elements; 'file' first appears deeper than depth 1 in the index
+        root = SElement(None, '')
+        SElement(SElement(root, 'a'), 'a.py').setType('file')
+        SElement(root, 'b').setType('class')
+        SElement(root, 'c.py').setType('file')
+        model = SGraph(root)
+        overview = OverviewService.get_model_overview(model, max_depth=1)
+        assert list(overview['summary']['type_distribution'].items()) == [
+            ('unknown', 2), ('class', 1), ('file', 1),
+        ]
+        overview = OverviewService.get_model_overview(model, max_depth=2)
+        assert list(overview['summary']['type_distribution']) == ['unknown', 'file', 'class']
+
+    def test_overview_is_memoized(self):
+        model = _model()
+        first = OverviewService.get_model_overview(model, max_depth=2)
+        assert OverviewService.get_model_overview(model, max_depth=2) is first
+        uncounted = OverviewService.get_model_overview(model, max_depth=2, include_counts=False)
+        assert uncounted is not first
+        assert OverviewService.get_model_overview(_model(), max_depth=2) is not first
+
+    @pytest.mark.asyncio
+    async def test_tool_leaves_memoized_overview_unchanged(self, monkeypatch):
+        class FakeMCP:
+            def __init__(self):
+                self.tools = {}
+
+            def tool(self):
+                def register(func):
+                    self.tools[func.__name__] = func
+                    return func
+                return register
+
+        model = _model()
+        monkeypatch.setattr(model_tools.model_manager, 'get_model', lambda model_id: model)
+        mcp = FakeMCP()
+        model_tools.register_tools(mcp)
+        overview = OverviewService.get_model_overview(model, max_depth=2)
+        expected = copy.deepcopy(overview)
+
+        tool = mcp.tools['sgraph_get_model_overview']
+        result = await tool(model_tools.SGraphGetModelOverview(model_id='m', max_depth=2))
+        assert result is overview
+        pydantic_core.to_json(result, fallback=str)  # as FastMCP serializes tool results
+        assert OverviewService.get_model_overview(model, max_depth=2) == expected
+
+    def test_forget_model(self):
+        model = _model()
+        first = OverviewService.get_model_overview(model, max_depth=2)
+        OverviewService.forget_model(model)
+        OverviewService.forget_model(model)  # already forgotten
+        assert model not in overview_service._overview_cache
+        assert OverviewService.get_model_overview(model, max_depth=2) is not first
+
+    def test_overviews_multi(self):
+        model = _model()
+        overviews = OverviewService.get_model_overviews_multi(model, [0, 1, 2])
+        assert list(overviews) == [0, 1, 2]
+        for depth, overview in overviews.items():
+            assert overview is OverviewService.get_model_overview(model, max_depth=depth)
+        assert [o['summary']['total_elements'] for o in overviews.values()] == [1, 2, 4]
+
+    def test_memo_is_bounded(self):
+        model = _model()
+        for depth in range(overview_service.OVERVIEW_CACHE_SIZE + 3):
+            OverviewService.get_model_overview(model, max_depth=depth)
+        assert len(overview_service._overview_cache[model]) == overview_service.OVERVIEW_CACHE_SIZE
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
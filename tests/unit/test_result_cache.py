@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ResultCache.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.core.result_cache import ResultCache
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    def setup_method(self):
+        self.cache = ResultCache(maxsize=2, ttl=60)
+
+    def test_key_ignores_argument_order(self):
+        assert ResultCache.make_key('tool', 'm1', {'a': 1, 'b': 2}) == \
+            ResultCache.make_key('tool', 'm1', {'b': 2, 'a': 1})
+
+    def test_get_and_set(self):
+        key = ResultCache.make_key('tool', 'm1', {'pattern': 'Service'})
+        assert self.cache.get(key) is None
+        self.cache.set(key, {'count': 1})
+        assert self.cache.get(key) == {'count': 1}
+
+    def test_least_recently_used_is_evicted(self):
+        keys = [ResultCache.make_key('tool', 'm1', {'n': n}) for n in range(3)]
+        self.cache.set(keys[0], 0)
+        self.cache.set(keys[1], 1)
+        self.cache.get(keys[0])
+        self.cache.set(keys[2], 2)
+        assert self.cache.get(keys[1]) is None
+        assert self.cache.get(keys[0]) == 0
+        assert self.cache.get(keys[2]) == 2
+
+    def test_expired_entries_are_dropped(self):
+        cache = ResultCache(ttl=-1)
+        key = ResultCache.make_key('tool', 'm1', {})
+        cache.set(key, 'value')
+        assert cache.get(key) is None
+        assert len(cache) == 0
+
+    def test_invalidate_model(self):
+        key1 = ResultCache.make_key('tool', 'm1', {})
+        key2 = ResultCache.make_key('tool', 'm2', {})
+        self.cache.set(key1, 1)
+        self.cache.set(key2, 2)
+        self.cache.invalidate_model('m1')
+        assert self.cache.get(key1) is None
+        assert self.cache.get(key2) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -3,6 +3,7 @@
 Unit tests for SearchService.
 """
 
+import re
 import pytest
 import sys
 import os
@@ -10,7 +11,13 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from src.services.search_service import SearchService
+from sgraph import SElement, SGraph
+from src.services import search_service
+from src.services.search_service import (
+    SearchService,
+    compile_attribute_predicate,
+    compile_name_pattern,
+)
 
 
 class TestSearchService:
@@ -39,5 +46,129 @@ class TestSearchService:
         assert SearchService.search_elements_by_attributes is not None
 
 
+    def test_get_elements_by_type_in_scope(self):
+        """Test type filtering with and without a scope."""
+        root = SElement(None, '')
+        project = SElement(root, 'Project')
+        src = SElement(project, 'src')
+        SElement(src, 'UserService').setType('class')
+        SElement(project, 'Helper').setType('class')
+        model = SGraph(root)
+
+        all_classes = SearchService.get_elements_by_type(model, 'class')
+        assert sorted(e.name for e in all_classes) == ['Helper', 'UserService']
+        scoped = SearchService.get_elements_by_type(model, 'class', '/Project/src')
+        assert [e.name for e in scoped] == ['UserService']
+        assert SearchService.get_elements_by_type(model, 'class', '/Missing') == []
+
+
+class TestCompileNamePattern:
+    """Test cases for the cached name pattern compiler."""
+
+    def test_regex_pattern(self):
+        assert compile_name_pattern(r'^User.*Service$').pattern == r'^User.*Service$'
+
+    def test_glob_fallback(self):
+        # '*foo' is not valid regex, so it is treated as a glob
+        regex = compile_name_pattern('*Service')
+        assert regex.search('UserService')
+        assert not regex.search('UserHandler')
+
+    def test_compiled_pattern_is_cached(self):
+        assert compile_name_pattern('Service') is compile_name_pattern('Service')
+
+    def test_search_accepts_compiled_pattern(self):
+        root = SElement(None, '')
+        project = SElement(root, 'Project')
+        SElement(project, 'UserService')
+        SElement(project, 'util')
+        model = SGraph(root)
+
+        by_string = SearchService.search_elements_by_name(model, 'Service')
+        by_pattern = SearchService.search_elements_by_name(model, re.compile('Service'))
+        assert [e.name for e in by_string] == ['UserService']
+        assert by_pattern == by_string
+
+    def test_literal_patterns_use_substring_search(self):
+        assert search_service._literal_text(re.compile('Service')) == 'Service'
+        assert search_service._literal_text(re.compile('Serv.ce')) is None
+        assert search_service._literal_text(re.compile('service', re.IGNORECASE)) is None
+
+        root = SElement(None, '')
+        project = SElement(root, 'Project')
+        SElement(project, 'UserService').setType('class')
+        SElement(project, 'service_test.py').setType('file')
+        model = SGraph(root)
+        assert [e.name for e in SearchService.search_elements_by_name(model, 'Service', 'class')] == ['UserService']
+        assert SearchService.search_elements_by_name(model, 'Service', 'file') == []
+
+    def test_anchored_literal_matches_exact_names(self):
+        root = SElement(None, '')
+        project = SElement(root, 'Project')
+        SElement(project, 'base.py')
+        SElement(project, 'base_py')
+        SElement(project, 'database.py')
+        model = SGraph(root)
+
+        results = SearchService.search_elements_by_name(model, r'^base\.py$')
+        assert [e.name for e in results] == ['base.py']
+        results = SearchService.search_elements_by_name(model, r'^base.py$')
+        assert sorted(e.name for e in results) == ['base.py', 'base_py']
+
+    @pytest.mark.parametrize('pattern', [r'\Aagent', r'tool\Z', r'\Atool\Z'])
+    def test_string_anchors_match_each_name(self, pattern):
+        root = SElement(None, '')
+        project = SElement(root, 'Project')
+        for name in ['agent_x', 'my_agent', 'tool', 'toolkit', 'x_tool']:
+            SElement(project, name)
+        model = SGraph(root)
+
+        expected = sorted(e.name for e in project.children if re.search(pattern, e.name))
+        assert expected
+        results = SearchService.search_elements_by_name(model, pattern)
+        assert sorted(e.name for e in results) == expected
+
+    @pytest.mark.parametrize('pattern', [
+        re.compile(r'^ab{,2}c$'),
+        re.compile(r'a b', re.VERBOSE),
+    ])
+    def test_python_only_syntax(self, pattern):
+        # Matches must not depend on whether Hyperscan pre-filters the scan
+        root = SElement(None, '')
+        project = SElement(root, 'Project')
+        for name in ['ac', 'abc', 'abbc', 'abbbc', 'ab{,2}c', 'ab', 'a b']:
+            SElement(project, name)
+        model = SGraph(root)
+
+        expected = sorted(e.name for e in project.children if pattern.search(e.name))
+        assert expected
+        results = SearchService.search_elements_by_name(model, pattern)
+        assert sorted(e.name for e in results) == expected
+
+
+class TestCompileAttributePredicate:
+    """Test cases for compiled attribute-filter predicates."""
+
+    def _element(self, name):
+        root = SElement(None, '')
+        return SElement(root, name)
+
+    def test_regex_and_equality(self):
+        element = self._element('UserService')
+        assert compile_attribute_predicate({'name': '^User'})(element)
+        assert not compile_attribute_predicate({'name': '^Service'})(element)
+        assert not compile_attribute_predicate({'name': 3})(element)
+
+    def test_missing_attribute_does_not_match(self):
+        assert not compile_attribute_predicate({'nope': 1})(self._element('x'))
+
+    def test_invalid_regex_falls_back_to_exact_match(self):
+        assert compile_attribute_predicate({'name': '('})(self._element('('))
+        assert not compile_attribute_predicate({'name': '('})(self._element('(x'))
+
+    def test_empty_filters_match_everything(self):
+        assert compile_attribute_predicate({})(self._element('x'))
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for input validators.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.core.model_manager import ModelManager
+from src.profiles.base import LoadModelInput, register_load_model
+from src.utils.validators import validate_model_id, validate_path
+
+
+class TestValidateModelId:
+    """Test cases for validate_model_id."""
+
+    def test_valid_id(self):
+        assert validate_model_id('kKB8oxOCot-brCcOblreC7VU')
+
+    def test_invalid_ids(self):
+        assert not validate_model_id('')
+        assert not validate_model_id('a' * 23)
+        assert not validate_model_id('a' * 23 + '!')
+        assert not validate_model_id('a' * 23 + 'ä')
+        assert not validate_model_id('a' * 23 + '\ud800')  # lone surrogate
+
+
+class TestValidatePath:
+    """Test cases for validate_path."""
+
+    def test_existing_file(self, tmp_path):
+        model = tmp_path / 'model.xml.zip'
+        model.write_bytes(b'12345')
+        is_valid, error, stat_result = validate_path(str(model))
+        assert (is_valid, error) == (True, None)
+        assert stat_result.st_size == 5
+
+    def test_no_stat_without_must_exist(self, tmp_path):
+        assert validate_path(str(tmp_path / 'new.xml.zip'), must_exist=False) == (True, None, None)
+
+    def test_missing_file(self, tmp_path):
+        is_valid, error, stat_result = validate_path(str(tmp_path / 'missing.xml.zip'))
+        assert not is_valid
+        assert 'does not exist' in error
+        assert stat_result is None
+
+    def test_traversal_rejected(self):
+        is_valid, error, _ = validate_path('models/../secret.xml.zip', must_exist=False)
+        assert not is_valid
+        assert 'traversal' in error
+
+    def test_inside_root(self, tmp_path):
+        model = tmp_path / 'model.xml.zip'
+        model.write_text('')
+        is_valid, error, _ = validate_path(str(model), root=str(tmp_path))
+        assert (is_valid, error) == (True, None)
+
+    def test_symlink_outside_root_rejected(self, tmp_path):
+        root = tmp_path / 'models'
+        root.mkdir()
+        outside = tmp_path / 'outside.xml.zip'
+        outside.write_text('')
+        link = root / 'link.xml.zip'
+        link.symlink_to(outside)
+
+        is_valid, error, _ = validate_path(str(link), root=str(root))
+        assert not is_valid
+        assert 'outside the allowed root' in error
+
+
+    @pytest.mark.asyncio
+    async def test_load_model_tool_uses_model_root(self, tmp_path, monkeypatch):
+        class FakeMCP:
+            def tool(self):
+                def register(func):
+                    self.load_model = func
+                    return func
+                return register
+
+        mcp = FakeMCP()
+        register_load_model(mcp)
+        monkeypatch.setattr(ModelManager, 'model_root', str(tmp_path))
+        model = os.path.join(os.path.dirname(__file__), '..', 'sgraph-and-mcp.xml.zip')
+
+        result = await mcp.load_model(LoadModelInput(path=os.path.abspath(model)))
+        assert 'outside the allowed root' in result['error']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
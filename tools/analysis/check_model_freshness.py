@@ -9,18 +9,26 @@ and recent analysis outputs. Useful for validating model updates.
 import sys
 import os
 import asyncio
+import re
 import time
+from collections import Counter
 from datetime import datetime
+from heapq import nlargest
+from operator import itemgetter
 from pathlib import Path
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.core.model_index import get_model_index
 from src.core.model_manager import ModelManager
 from src.services.search_service import SearchService
 from src.services.overview_service import OverviewService
 
+# File names that indicate recent analysis work (searched, not matched)
+ANALYSIS_FILE_PATTERN = re.compile(r"analysis|test|performance")
+
 
 async def check_model_freshness(model_path: str, project_name: str = "sgraph-and-mcp"):
     """
@@ -77,9 +85,10 @@ async def check_model_freshness(model_path: str, project_name: str = "sgraph-and
             "type_distribution": overview['summary']['type_distribution']
         }
         
-        # Check for freshness indicators
+        # Check for freshness indicators. These lookups (and the scoped one
+        # below) are slices of the model index's type column, not tree walks.
         analysis_files = SearchService.search_elements_by_name(
-            model, ".*analysis.*|.*test.*|.*performance.*", element_type="file"
+            model, ANALYSIS_FILE_PATTERN, element_type="file"
         )
         
         throwaway_files = SearchService.get_elements_by_type(
@@ -97,22 +106,27 @@ async def check_model_freshness(model_path: str, project_name: str = "sgraph-and
         # Check for modular architecture
         base_path = f"/{project_name}/{project_name.split('-')[0]}-mcp-server/src"
         
-        core_elements = SearchService.get_elements_by_type(
-            model, "file", scope_path=f"{base_path}/core"
-        )
-        service_elements = SearchService.get_elements_by_type(
-            model, "file", scope_path=f"{base_path}/services"
-        )
-        tool_elements = SearchService.get_elements_by_type(
-            model, "file", scope_path=f"{base_path}/tools"
+        # One lookup for all of src/, bucketed by the package directly below it
+        src_files = SearchService.get_elements_by_type(model, "file", scope_path=base_path)
+        index = get_model_index(model)
+        packages = Counter(
+            package
+            for package, sep, _ in (
+                index.path_of(element)[len(base_path) + 1:].partition("/")
+                for element in src_files
+            )
+            if sep
         )
+        core_count = packages["core"]
+        service_count = packages["services"]
+        tool_count = packages["tools"]
         
         result["architecture_analysis"] = {
-            "core_modules": len(core_elements),
-            "service_modules": len(service_elements),
-            "tool_modules": len(tool_elements),
-            "has_modular_structure": len(core_elements) > 0 and len(service_elements) > 0,
-            "modular_completeness": len(core_elements) + len(service_elements) + len(tool_elements)
+            "core_modules": core_count,
+            "service_modules": service_count,
+            "tool_modules": tool_count,
+            "has_modular_structure": core_count > 0 and service_count > 0,
+            "modular_completeness": core_count + service_count + tool_count
         }
         
         return result
@@ -146,8 +160,8 @@ def print_freshness_report(result: dict):
     print(f"  Load time: {stats['load_time_seconds']}s")
     
     print(f"\n🏷️  Type distribution:")
-    for element_type, count in sorted(stats['type_distribution'].items(), 
-                                    key=lambda x: x[1], reverse=True)[:8]:
+    # Only the eight most common types are shown; no need to sort them all
+    for element_type, count in nlargest(8, stats['type_distribution'].items(), key=itemgetter(1)):
         print(f"  {element_type}: {count}")
     
     # Freshness indicators
@@ -206,8 +220,9 @@ async def main():
     result = await check_model_freshness(args.model_path, args.project)
     
     if args.json:
-        import json
-        print(json.dumps(result, indent=2))
+        # pydantic-core's Rust encoder, as used for the MCP tool results
+        import pydantic_core
+        print(pydantic_core.to_json(result, indent=2, fallback=str).decode())
     else:
         print_freshness_report(result)
 
@@ -9,18 +9,52 @@ This mirrors the MCP tool logic but runs locally for easy artifact generation.
 import os
 import sys
 import hashlib
+import io
+import subprocess
 from pathlib import Path
-from typing import Dict, Any, Set, Tuple
+from typing import IO, Dict, Any, List, Tuple
 
+from src.core.model_manager import ModelManager
 from src.sgraph_helper import SGraphHelper
 
+try:
+    import pygraphviz
+except ImportError:  # Optional: uv sync --extra pygraphviz (renders in-process via libgvc)
+    pygraphviz = None
 
-def sanitize_id(path: str) -> str:
-    """Create a stable, DOT-safe node id from a path."""
-    # Use quoted id; also append a short hash to avoid collisions on same basename
+GRAPH_ATTRS = {"fontname": "Helvetica", "fontsize": "10", "splines": "true", "overlap": "false"}
+NODE_ATTRS = {"fontname": "Helvetica", "fontsize": "9", "shape": "box", "style": "rounded"}
+EDGE_ATTRS = {"fontname": "Helvetica", "fontsize": "8", "color": "gray40", "arrowsize": "0.7"}
+
+
+def _dot_attrs(attrs: Dict[str, str]) -> str:
+    return ", ".join(f"{key}={value}" for key, value in attrs.items())
+
+
+# The fixed parts of every DOT file, formatted once from the attributes above
+DOT_HEADER = (
+    "digraph G {\n"
+    "  rankdir=LR;\n"
+    f"  graph [{_dot_attrs(GRAPH_ATTRS)}];\n"
+    f"  node  [{_dot_attrs(NODE_ATTRS)}];\n"
+    f"  edge  [{_dot_attrs(EDGE_ATTRS)}];\n"
+)
+DOT_FOOTER = "}\n"
+
+
+def node_name(path: str) -> str:
+    """Create a stable node name from a path."""
+    # Append a short hash to avoid collisions on same basename
     base = path or "<root>"
-    short_hash = hashlib.sha1(path.encode("utf-8")).hexdigest()[:8]
-    return f'"{base}::{short_hash}"'
+    # A short non-security tag; BLAKE2s with a 4-byte digest is cheaper than
+    # SHA-1 and yields the 8 hex digits directly
+    short_hash = hashlib.blake2s(path.encode("utf-8"), digest_size=4).hexdigest()
+    return f"{base}::{short_hash}"
+
+
+def sanitize_id(path: str) -> str:
+    """Create a stable, DOT-safe (quoted) node id from a path."""
+    return f'"{node_name(path)}"'
 
 
 def label_for(path: str) -> str:
@@ -31,9 +65,17 @@ def label_for(path: str) -> str:
     return name
 
 
-def build_dot(deps: Dict[str, Any]) -> str:
-    nodes: Set[str] = set()
-    edges: Set[Tuple[str, str]] = set()
+def collect_graph(
+    deps: Dict[str, Any], stable: bool = False
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Collect the nodes and edges to draw from subtree dependencies.
+
+    They come in order of first appearance in the dependency list (which is
+    deterministic for a given model), or sorted by path when ``stable`` is set.
+    """
+    # Dicts deduplicate while keeping insertion order
+    nodes: Dict[str, None] = {}
+    edges: Dict[Tuple[str, str], None] = {}
 
     # Only show internal dependencies to keep the graph readable
     for dep in deps.get("internal_dependencies", []):
@@ -41,35 +83,74 @@ def build_dot(deps: Dict[str, Any]) -> str:
         dst = dep.get("to", "")
         if not src or not dst:
             continue
-        nodes.add(src)
-        nodes.add(dst)
-        edges.add((src, dst))
+        nodes[src] = None
+        nodes[dst] = None
+        edges[src, dst] = None
+    if stable:
+        return sorted(nodes), sorted(edges)
+    return list(nodes), list(edges)
+
+
+def agraph_from_deps(deps: Dict[str, Any], stable: bool = False) -> "pygraphviz.AGraph":
+    """Build the dependency graph in memory as a pygraphviz AGraph."""
+    nodes, edges = collect_graph(deps, stable)
+    graph = pygraphviz.AGraph(directed=True, rankdir="LR")
+    graph.graph_attr.update(GRAPH_ATTRS)
+    graph.node_attr.update(NODE_ATTRS)
+    graph.edge_attr.update(EDGE_ATTRS)
 
-    lines = []
-    lines.append("digraph G {")
-    lines.append("  rankdir=LR;")
-    lines.append("  graph [fontname=Helvetica, fontsize=10, splines=true, overlap=false];")
-    lines.append("  node  [fontname=Helvetica, fontsize=9, shape=box, style=rounded];")
-    lines.append("  edge  [fontname=Helvetica, fontsize=8, color=gray40, arrowsize=0.7];")
+    names = {path: node_name(path) for path in nodes}
+    for path in nodes:
+        graph.add_node(names[path], label=label_for(path), tooltip=path or "<root>")
+    for src, dst in edges:
+        graph.add_edge(names[src], names[dst])
+    return graph
+
+
+def build_dot(deps: Dict[str, Any], out: IO[str], stable: bool = False) -> None:
+    """Write the dependency graph as DOT source to ``out``, line by line."""
+    nodes, edges = collect_graph(deps, stable)
+
+    out.write(DOT_HEADER)
+
+    # Each node id is hashed once; edges look their endpoints up
+    node_ids = {path: sanitize_id(path) for path in nodes}
 
     # Nodes
-    for path in sorted(nodes):
-        node_id = sanitize_id(path)
+    for path in nodes:
+        node_id = node_ids[path]
         label = label_for(path)
         tooltip = path or "<root>"
-        lines.append(f"  {node_id} [label=\"{label}\", tooltip=\"{tooltip}\"]; ")
+        out.write(f"  {node_id} [label=\"{label}\", tooltip=\"{tooltip}\"]; \n")
 
     # Edges
-    for src, dst in sorted(edges):
-        src_id = sanitize_id(src)
-        dst_id = sanitize_id(dst)
-        lines.append(f"  {src_id} -> {dst_id};")
+    for src, dst in edges:
+        out.write(f"  {node_ids[src]} -> {node_ids[dst]};\n")
 
-    lines.append("}")
-    return "\n".join(lines) + "\n"
+    out.write(DOT_FOOTER)
 
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render the sgraph-mcp-server dependency graph")
+    parser.add_argument(
+        "--keep-dot",
+        action="store_true",
+        help="Also write the DOT source next to the SVG",
+    )
+    parser.add_argument(
+        "--stable",
+        action="store_true",
+        help="Sort nodes and edges by path (for diffing outputs of different models)",
+    )
+    parser.add_argument(
+        "--dot",
+        action="store_true",
+        help="Render through the dot command even when pygraphviz is installed",
+    )
+    args = parser.parse_args()
+
     model_path = os.environ.get(
         "SGRAPH_MODEL",
         "/opt/softagram/output/projects/sgraph-and-mcp/latest.xml.zip",
@@ -80,19 +161,13 @@ def main():
     dot_path = output_dir / "sgraph-mcp-server-deps.dot"
     svg_path = output_dir / "sgraph-mcp-server-deps.svg"
 
+    # Load through ModelManager so repeated runs restore the parsed model from
+    # its on-disk snapshot (keyed by path, mtime and size) instead of parsing
+    manager = ModelManager()
+    model = manager.get_model(manager.load_model_sync(model_path))
+
+    # Compute dependencies locally
     helper = SGraphHelper()
-    # Load model and compute dependencies locally
-    model_id = helper._models.get("__tmp__")
-    if not model_id:
-        # Load the model (cached in helper)
-        # Note: load_sgraph is async; run blocking through asyncio.run
-        import asyncio
-
-        asyncio.run(helper.load_sgraph(model_path))
-
-    # Grab the (single) model instance from cache
-    # Since helper returns a random id, just get the last one
-    model = list(helper._models.values())[-1]
     deps = helper.get_subtree_dependencies(
         model,
         root_path=subtree,
@@ -100,16 +175,42 @@ def main():
         max_depth=3,
     )
 
-    dot = build_dot(deps)
-    dot_path.write_text(dot, encoding="utf-8")
-
-    # Render to SVG with dot
-    ret = os.system(f'dot -Tsvg "{dot_path}" -o "{svg_path}"')
-    if ret != 0:
+    if pygraphviz is not None and not args.dot:
+        # Lay out and render in-process; no DOT text or subprocess involved
+        graph = agraph_from_deps(deps, args.stable)
+        if args.keep_dot:
+            graph.write(str(dot_path))
+            print(f"DOT: {dot_path}")
+        graph.draw(str(svg_path), format="svg", prog="dot")
+        print(f"SVG: {svg_path}")
+        return
+
+    # Render to SVG with dot (no shell). The DOT source is streamed to it,
+    # or written to the .dot file that dot then reads, never held in memory.
+    command = ["dot", "-Tsvg", "-o", str(svg_path)]
+    try:
+        if args.keep_dot:
+            with dot_path.open("w", encoding="utf-8") as out:
+                build_dot(deps, out, args.stable)
+            with dot_path.open("rb") as dot_file:
+                returncode = subprocess.run(command, stdin=dot_file, check=False).returncode
+        else:
+            proc = subprocess.Popen(command, stdin=subprocess.PIPE)
+            try:
+                with io.TextIOWrapper(proc.stdin, encoding="utf-8") as out:
+                    build_dot(deps, out, args.stable)
+            except BrokenPipeError:
+                pass  # dot exited early; its return code tells why
+            returncode = proc.wait()
+    except FileNotFoundError:
+        print("dot not found; install Graphviz", file=sys.stderr)
+        sys.exit(2)
+    if returncode != 0:
         print("dot rendering failed", file=sys.stderr)
         sys.exit(2)
 
-    print(f"DOT: {dot_path}")
+    if args.keep_dot:
+        print(f"DOT: {dot_path}")
     print(f"SVG: {svg_path}")
 
 
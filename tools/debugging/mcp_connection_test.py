@@ -7,29 +7,28 @@ Useful for debugging MCP timing issues and server problems.
 """
 
 import asyncio
+import shutil
+import socket
 import subprocess
 import time
 import json
 import sys
+import urllib.error
+import urllib.parse
+import urllib.request
 from pathlib import Path
 
+import pydantic_core
 
-def check_server_port(port: int = 8008):
-    """Check if a server is running on the specified port."""
+
+def check_server_port(port: int = 8008, host: str = "localhost"):
+    """Check if a server is accepting connections on the specified port."""
     
     try:
-        result = subprocess.run(
-            ["lsof", "-i", f":{port}"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        if result.returncode == 0 and "LISTEN" in result.stdout:
+        with socket.create_connection((host, port), timeout=1.0):
             return True, f"Server running on port {port}"
-        else:
-            return False, f"No server found on port {port}"
-            
+    except OSError:
+        return False, f"No server found on port {port}"
     except Exception as e:
         return False, f"Error checking port: {str(e)}"
 
@@ -38,27 +37,34 @@ def test_http_connectivity(url: str, timeout: int = 5):
     """Test basic HTTP connectivity to the server."""
     
     try:
-        result = subprocess.run(
-            ["curl", "-s", "--max-time", str(timeout), url],
-            capture_output=True,
-            text=True,
-            timeout=timeout + 2
-        )
-        
-        return result.returncode == 0, result.stdout[:200] if result.stdout else result.stderr[:200]
-        
-    except subprocess.TimeoutExpired:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            body = response.read(200)
+    except urllib.error.HTTPError as e:
+        # The server answered, just not with a 2xx (curl -s counted this as success too)
+        body = e.read(200)
+    except TimeoutError:
         return False, "HTTP request timed out"
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, TimeoutError):
+            return False, "HTTP request timed out"
+        return False, f"HTTP test error: {e.reason}"
     except Exception as e:
         return False, f"HTTP test error: {str(e)}"
+    
+    return True, body.decode("utf-8", errors="replace")
 
 
 def check_nodejs_version():
     """Check Node.js version for mcp-remote compatibility."""
     
+    # Only spawn node when it is installed at all
+    node = shutil.which("node")
+    if node is None:
+        return False, "Node.js not found"
+    
     try:
         result = subprocess.run(
-            ["node", "--version"],
+            [node, "--version"],
             capture_output=True,
             text=True,
             timeout=5
@@ -80,12 +86,26 @@ def check_nodejs_version():
         return False, f"Node.js check error: {str(e)}"
 
 
+def count_listed_tools(output: str):
+    """Count the tools in a JSON-RPC tools/list response; None if there is none.
+
+    mcp-remote writes one JSON-RPC message per line; other lines are ignored.
+    """
+    for line in output.splitlines():
+        try:
+            message = json.loads(line)
+            return len(message["result"]["tools"])
+        except (ValueError, KeyError, TypeError):
+            continue
+    return None
+
+
 def test_mcp_remote_connection(server_url: str, timeout: int = 10):
     """Test mcp-remote connection to the server."""
     
     try:
         # Test with a simple tools list request
-        test_request = {"method": "tools/list", "params": {}}
+        test_request = {"jsonrpc": "2.0", "id": 1, "method": "tools/list", "params": {}}
         
         cmd = [
             "npx", "mcp-remote", server_url,
@@ -101,18 +121,10 @@ def test_mcp_remote_connection(server_url: str, timeout: int = 10):
         )
         
         if result.returncode == 0:
-            # Try to parse the output to count tools
-            try:
-                # Look for tool count in output
-                lines = result.stdout.split('\n')
-                tool_count = 0
-                for line in lines:
-                    if 'tools' in line.lower() and 'name' in line:
-                        tool_count += 1
-                
-                return True, f"MCP connection successful ({tool_count} tools found)"
-            except:
+            tool_count = count_listed_tools(result.stdout)
+            if tool_count is None:
                 return True, "MCP connection successful (couldn't parse tool count)"
+            return True, f"MCP connection successful ({tool_count} tools found)"
         else:
             return False, f"MCP connection failed: {result.stderr[:200]}"
             
@@ -128,37 +140,44 @@ async def run_connection_diagnostics(server_url: str = "http://localhost:8008/ss
     print("🔧 MCP CONNECTION DIAGNOSTICS")
     print("=" * 50)
     
-    port = 8008  # Extract from URL or default
-    if ":" in server_url:
-        try:
-            port = int(server_url.split(":")[-1].split("/")[0])
-        except:
-            pass
+    url = urllib.parse.urlparse(server_url)
+    host = url.hostname or "localhost"
+    try:
+        port = url.port or 8008
+    except ValueError:
+        port = 8008
+    # Scheme and authority only; the HTTP check probes the server root
+    base_url = f"{url.scheme or 'http'}://{url.netloc or f'{host}:{port}'}"
     
     diagnostics = {}
     
+    # The first three checks are independent and mostly wait on I/O,
+    # so they run concurrently; results are reported in order below
+    (is_running, message), (http_ok, http_message), (node_ok, node_message) = await asyncio.gather(
+        asyncio.to_thread(check_server_port, port, host),
+        asyncio.to_thread(test_http_connectivity, base_url),
+        asyncio.to_thread(check_nodejs_version),
+    )
+    
     # 1. Check server port
     print("1️⃣  Checking server port...")
-    is_running, message = check_server_port(port)
     diagnostics["server_port"] = {"status": is_running, "message": message}
     print(f"   {message}")
     
     # 2. Test HTTP connectivity
     print("\n2️⃣  Testing HTTP connectivity...")
-    http_ok, http_message = test_http_connectivity(server_url.replace("/sse", ""))
     diagnostics["http_connectivity"] = {"status": http_ok, "message": http_message}
     print(f"   HTTP: {'✅' if http_ok else '❌'} {http_message}")
     
     # 3. Check Node.js version
     print("\n3️⃣  Checking Node.js version...")
-    node_ok, node_message = check_nodejs_version()
     diagnostics["nodejs_version"] = {"status": node_ok, "message": node_message}
     print(f"   {node_message}")
     
     # 4. Test MCP connection (only if server is running)
     print("\n4️⃣  Testing MCP connection...")
     if is_running:
-        mcp_ok, mcp_message = test_mcp_remote_connection(server_url)
+        mcp_ok, mcp_message = await asyncio.to_thread(test_mcp_remote_connection, server_url)
         diagnostics["mcp_connection"] = {"status": mcp_ok, "message": mcp_message}
         print(f"   {mcp_message}")
     else:
@@ -220,7 +239,8 @@ async def main():
     success, diagnostics = await run_connection_diagnostics(args.url)
     
     if args.json:
-        print(json.dumps(diagnostics, indent=2))
+        # pydantic-core's Rust encoder, as used for the MCP tool results
+        print(pydantic_core.to_json(diagnostics, indent=2, fallback=str).decode())
     
     sys.exit(0 if success else 1)
 
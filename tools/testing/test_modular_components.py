@@ -9,6 +9,8 @@ Useful for validating architecture changes and refactoring.
 import sys
 import os
 import asyncio
+import importlib
+import importlib.util
 from pathlib import Path
 
 # Add project root to path
@@ -16,34 +18,52 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 
+# Modules and the names they must expose, grouped by layer
+EXPECTED_EXPORTS = {
+    "core": {
+        "src.core.model_manager": ["ModelManager"],
+        "src.core.element_converter": ["ElementConverter"],
+    },
+    "services": {
+        "src.services.search_service": ["SearchService"],
+        "src.services.dependency_service": ["DependencyService"],
+        "src.services.overview_service": ["OverviewService"],
+    },
+    "utils": {
+        "src.utils.validators": ["validate_model_id", "validate_path"],
+        "src.utils.logging": ["setup_logging"],
+    },
+}
+
+
 async def test_component_imports():
     """Test that all modular components can be imported correctly."""
     
     print("🧪 Testing component imports...")
     results = {}
-    
-    try:
-        # Test core components
-        from src.core.model_manager import ModelManager
-        from src.core.element_converter import ElementConverter
-        results["core"] = "✅ PASS"
+    success = True
+    
+    # Each module is checked on its own, so one failure doesn't hide the others
+    for layer, modules in EXPECTED_EXPORTS.items():
+        failures = []
+        for module_name, names in modules.items():
+            try:
+                if importlib.util.find_spec(module_name) is None:
+                    failures.append(f"{module_name} not found")
+                    continue
+                module = importlib.import_module(module_name)
+            except Exception as e:
+                failures.append(f"{module_name}: {str(e)}")
+                continue
+            failures.extend(f"{module_name}.{name} missing" for name in names if not hasattr(module, name))
         
-        # Test services
-        from src.services.search_service import SearchService
-        from src.services.dependency_service import DependencyService
-        from src.services.overview_service import OverviewService
-        results["services"] = "✅ PASS"
-        
-        # Test utils
-        from src.utils.validators import validate_model_id, validate_path
-        from src.utils.logging import setup_logging
-        results["utils"] = "✅ PASS"
-        
-        return True, results
-        
-    except Exception as e:
-        results["error"] = f"❌ FAIL: {str(e)}"
-        return False, results
+        if failures:
+            results[layer] = f"❌ FAIL: {'; '.join(failures)}"
+            success = False
+        else:
+            results[layer] = "✅ PASS"
+    
+    return success, results
 
 
 async def test_component_functionality(model_path: str = None):
@@ -107,27 +127,20 @@ def test_service_isolation():
         from src.services.overview_service import OverviewService
         
         # Check that services have expected static methods
-        search_methods = ["search_elements_by_name", "get_elements_by_type", "search_elements_by_attributes"]
-        dependency_methods = ["get_subtree_dependencies", "get_dependency_chain", "get_multiple_elements"]
-        overview_methods = ["get_model_overview"]
-        
-        for method in search_methods:
-            if hasattr(SearchService, method) and callable(getattr(SearchService, method)):
-                results[f"search_{method}"] = "✅ PASS"
-            else:
-                results[f"search_{method}"] = "❌ FAIL: Method missing"
+        expected_methods = {
+            "search": (SearchService, ["search_elements_by_name", "get_elements_by_type", "search_elements_by_attributes"]),
+            "dependency": (DependencyService, ["get_subtree_dependencies", "get_dependency_chain", "get_multiple_elements"]),
+            "overview": (OverviewService, ["get_model_overview"]),
+        }
         
-        for method in dependency_methods:
-            if hasattr(DependencyService, method) and callable(getattr(DependencyService, method)):
-                results[f"dependency_{method}"] = "✅ PASS"
-            else:
-                results[f"dependency_{method}"] = "❌ FAIL: Method missing"
-                
-        for method in overview_methods:
-            if hasattr(OverviewService, method) and callable(getattr(OverviewService, method)):
-                results[f"overview_{method}"] = "✅ PASS"
-            else:
-                results[f"overview_{method}"] = "❌ FAIL: Method missing"
+        for prefix, (service, methods) in expected_methods.items():
+            # One pass over the class namespace instead of a lookup per method
+            present = {name for name, value in vars(service).items() if callable(value)}
+            for method in methods:
+                if method in present:
+                    results[f"{prefix}_{method}"] = "✅ PASS"
+                else:
+                    results[f"{prefix}_{method}"] = "❌ FAIL: Method missing"
         
         return True, results
         